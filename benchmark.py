@@ -0,0 +1,386 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+import requests
+from pymongo import MongoClient
+
+import scraping2
+
+try:
+    import resource
+except ImportError:  # Windows : pas de mesure du pic de mémoire
+    resource = None
+
+# ------------------- CONFIGURATION -------------------
+BENCHMARK_QUERY = "Sultan Moulay Slimane University"
+BENCHMARK_EMAIL = "benchmark@example.org"
+BENCHMARK_DATABASE = "academic_benchmark"
+BENCHMARK_SIZES = [100, 1000, 10000, 100000]
+BENCHMARK_SOURCES = list(scraping2.SOURCES)
+
+# Hôtes interrogés par AcademicScraper, tous servis par le serveur local
+FIXTURE_HOSTS = [
+    'export.arxiv.org', 'api.openalex.org', 'eutils.ncbi.nlm.nih.gov', 'scilit.net',
+    'scholar.google.com', 'link.springer.com', 'hal.archives-ouvertes.fr',
+    'www.researchgate.net', 'citeseerx.ist.psu.edu',
+]
+UNLIMITED_RATE = (1_000_000, 1)
+ESEARCH_MAX_IDS = 10000  # comme NCBI : esearch ne liste que les 10 000 premiers IDs
+
+WORDS = (
+    "learning deep neural network model analysis data water soil argan climate morocco quality "
+    "detection prediction optimization energy solar irrigation agriculture health patients clinical "
+    "survey method approach framework system evaluation sensor remote imaging classification "
+    "segmentation transfer graph language semantic knowledge ontology retrieval mining robust "
+    "adaptive efficient distributed parallel secure privacy blockchain cloud edge mobile wireless"
+).split()
+FIRST_NAMES = ["Anas", "Fatima", "Youssef", "Salma", "Omar", "Khadija", "Hamza", "Imane", "Karim", "Nadia"]
+LAST_NAMES = ["Battas", "Alaoui", "Bennani", "Tazi", "Idrissi", "Chraibi", "Fassi", "Berrada", "Amrani", "Lahlou"]
+
+
+# ------------------- FIXTURES -------------------
+def fixture_record(source, index):
+    # Notice déterministe (même source + index = même notice d'une exécution à l'autre)
+    rng = random.Random(f"{source}:{index}")
+    authors = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(rng.randint(1, 4))]
+    abstract = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+    return {
+        'index': index,
+        'title': f"{' '.join(rng.choice(WORDS) for _ in range(8)).capitalize()} {source} {index}",
+        'authors': authors,
+        'year': rng.randint(2000, 2024),
+        'journal': f"Journal of {rng.choice(WORDS).capitalize()}",
+        'abstract': f"{authors[0]} from Sultan Moulay Slimane University in Morocco studies {abstract}.",
+        'keywords': rng.sample(WORDS, 3),
+        'doi': f"10.5555/{source}.{index}",
+    }
+
+def fixture_records(source, start, count, size):
+    return [fixture_record(source, index) for index in range(start, min(start + count, size))]
+
+def arxiv_fixture(params, size):
+    start, count = int(params.get('start', 0)), int(params.get('max_results', 10))
+    entries = ''.join(
+        f"<entry><id>http://arxiv.org/abs/2101.{r['index']:05d}v1</id>"
+        f"<updated>{r['year']}-01-01T00:00:00Z</updated><published>{r['year']}-01-01T00:00:00Z</published>"
+        f"<title>{escape(r['title'])}</title><summary>{escape(r['abstract'])}</summary>"
+        + ''.join(f"<author><name>{escape(a)}</name></author>" for a in r['authors'])
+        + ''.join(f'<category term="{k}"/>' for k in r['keywords'])
+        + f"<arxiv:doi>{r['doi']}</arxiv:doi></entry>"
+        for r in fixture_records('arxiv', start, count, size)
+    )
+    return 'application/atom+xml', (
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        f"<opensearch:totalResults>{size}</opensearch:totalResults>{entries}</feed>"
+    )
+
+def openalex_fixture(params, size):
+    cursor = params.get('cursor', '*')
+    start, count = (0 if cursor == '*' else int(cursor)), int(params.get('per_page', 25))
+    works = []
+    for r in fixture_records('openalex', start, count, size):
+        words = r['abstract'].split()
+        inverted = {}
+        for position, word in enumerate(words):
+            inverted.setdefault(word, []).append(position)
+        works.append({
+            'title': r['title'],
+            'authorships': [{'author': {'display_name': a}} for a in r['authors']],
+            'publication_date': f"{r['year']}-01-01",
+            'primary_location': {'source': {'display_name': r['journal']}},
+            'abstract_inverted_index': inverted,
+            'doi': f"https://doi.org/{r['doi']}",
+            'ids': {'pmid': f"https://pubmed.ncbi.nlm.nih.gov/{r['index'] + 1}"},
+            'keywords': [{'display_name': k} for k in r['keywords']],
+        })
+    next_cursor = str(start + count) if start + count < size else None
+    return 'application/json', json.dumps({'meta': {'count': size, 'next_cursor': next_cursor}, 'results': works})
+
+def esearch_fixture(params, size):
+    start, count = int(params.get('retstart', 0)), int(params.get('retmax', 20))
+    ids = ''.join(f"<Id>{index + 1}</Id>" for index in range(start, min(start + count, size, ESEARCH_MAX_IDS)))
+    return 'text/xml', (
+        f"<eSearchResult><Count>{size}</Count><RetMax>{count}</RetMax><RetStart>{start}</RetStart>"
+        f"<QueryKey>1</QueryKey><WebEnv>MCID_BENCHMARK</WebEnv><IdList>{ids}</IdList></eSearchResult>"
+    )
+
+def efetch_fixture(params, size):
+    db = params.get('db', 'pubmed')
+    start, count = int(params.get('retstart', 0)), int(params.get('retmax', 20))
+    if params.get('rettype') == 'uilist':
+        # Liste d'IDs depuis le serveur d'historique, sans la limite d'esearch
+        return 'text/plain', ''.join(f"{index + 1}\n" for index in range(start, min(start + count, size)))
+    if params.get('id'):
+        records = [fixture_record(db, int(pmid) - 1) for pmid in params['id'].split(',')]
+    else:
+        records = fixture_records(db, start, count, size)
+    articles = ''.join(
+        f"<PubmedArticle><MedlineCitation><PMID>{r['index'] + 1}</PMID><Article>"
+        f"<Journal><Title>{escape(r['journal'])}</Title><JournalIssue><PubDate><Year>{r['year']}</Year>"
+        f"</PubDate></JournalIssue></Journal><ArticleTitle>{escape(r['title'])}</ArticleTitle>"
+        f"<Abstract><AbstractText>{escape(r['abstract'])}</AbstractText></Abstract><AuthorList>"
+        + ''.join(
+            f"<Author><LastName>{escape(a.split()[1])}</LastName><ForeName>{escape(a.split()[0])}</ForeName></Author>"
+            for a in r['authors']
+        )
+        + "</AuthorList></Article><KeywordList>"
+        + ''.join(f"<Keyword>{k}</Keyword>" for k in r['keywords'])
+        + f"</KeywordList></MedlineCitation><PubmedData><ArticleIdList><ArticleId IdType=\"doi\">{r['doi']}"
+        "</ArticleId></ArticleIdList></PubmedData></PubmedArticle>"
+        for r in records
+    )
+    return 'text/xml', f"<PubmedArticleSet>{articles}</PubmedArticleSet>"
+
+def scilit_fixture(params, size):
+    results = [
+        {'title': r['title'], 'authors': [{'name': a} for a in r['authors']], 'year': r['year'],
+         'journal': r['journal'], 'abstract': r['abstract'], 'doi': r['doi'], 'keywords': r['keywords']}
+        for r in fixture_records('scilit', 0, int(params.get('limit', 10)), size)
+    ]
+    return 'application/json', json.dumps({'results': results})
+
+def google_scholar_fixture(params, size):
+    items = ''.join(
+        f"<div class=\"gs_ri\"><h3><a href=\"https://example.org/gs/{r['index']}\">{escape(r['title'])}</a></h3>"
+        f"<div class=\"gs_a\">{escape(', '.join(r['authors']))} - {escape(r['journal'])}, {r['year']}</div></div>"
+        for r in fixture_records('google_scholar', int(params.get('start', 0)), 10, size)
+    )
+    return 'text/html', f"<html><body>{items}</body></html>"
+
+def listing_fixture(source, item_tag, item_class, title_tag, author_class, limit_param):
+    # Même structure que celle attendue par scraping2.listing_extractor (HtmlExtractor)
+    def fixture(params, size):
+        items = ''.join(
+            f"<{item_tag} class=\"{item_class}\"><{title_tag}>{escape(r['title'])}</{title_tag}>"
+            f"<a href=\"https://example.org/{source}/{r['index']}\">link</a>"
+            + ''.join(f"<span class=\"{author_class}\">{escape(a)}</span>" for a in r['authors'])
+            + f"<span class=\"year\">{r['year']}</span><span class=\"journal\">{escape(r['journal'])}</span>"
+            f"</{item_tag}>"
+            for r in fixture_records(source, 0, int(params.get(limit_param, 10)), size)
+        )
+        return 'text/html', f"<html><body>{items}</body></html>"
+    return fixture
+
+# (hôte, chemin) -> générateur de réponse
+FIXTURES = {
+    ('export.arxiv.org', '/api/query'): arxiv_fixture,
+    ('api.openalex.org', '/works'): openalex_fixture,
+    ('eutils.ncbi.nlm.nih.gov', '/entrez/eutils/esearch.fcgi'): esearch_fixture,
+    ('eutils.ncbi.nlm.nih.gov', '/entrez/eutils/efetch.fcgi'): efetch_fixture,
+    ('scilit.net', '/api/v1/search'): scilit_fixture,
+    ('scholar.google.com', '/scholar'): google_scholar_fixture,
+    ('link.springer.com', '/search'): listing_fixture('springer', 'li', 'result-item', 'h2', 'authors', 'show'),
+    ('hal.archives-ouvertes.fr', '/search/index/'): listing_fixture('hal', 'div', 'record', 'h2', 'author', 'rows'),
+    ('www.researchgate.net', '/search'): listing_fixture('researchgate', 'div', 'publication-item', 'h2', 'author', 'limit'),
+    ('citeseerx.ist.psu.edu', '/search'): listing_fixture('citeseerx', 'div', 'result', 'h3', 'author', 'rows'),
+}
+
+
+# ------------------- SERVEUR LOCAL -------------------
+class FixtureHandler(BaseHTTPRequestHandler):
+    # Chemin : /<taille du corpus>/<hôte d'origine>/<chemin d'origine>?<paramètres>
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self, body_params):
+        parts = urlsplit(self.path)
+        size, host, path = parts.path.lstrip('/').split('/', 2)
+        params = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        params.update(body_params)
+        fixture = FIXTURES.get((host, '/' + path))
+        if fixture is None:
+            self.send_error(404)
+            return
+        content_type, body = fixture(params, int(size))
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond({})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8')
+        self._respond({k: v[-1] for k, v in parse_qs(body).items()})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fixture-server', daemon=True).start()
+    return server
+
+
+class LocalAdapter(requests.adapters.HTTPAdapter):
+    # Redirige chaque requête vers le serveur local en gardant l'hôte d'origine dans le chemin
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.base_url}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+        return super().send(request, **kwargs)
+
+
+class BenchmarkScraper(scraping2.AcademicScraper):
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def new_session(self):
+        session = super().new_session()
+        adapter = LocalAdapter(self.base_url)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+
+# ------------------- MESURES -------------------
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kio sous Linux, octets sous macOS
+    return peak / (1024 * 1024) if platform.system() == 'Darwin' else peak / 1024
+
+def open_collection(mongo_uri, name):
+    if mongo_uri:
+        return MongoClient(mongo_uri)[BENCHMARK_DATABASE][name]
+    try:
+        import mongomock
+    except ImportError:
+        raise SystemExit("mongomock is required without --mongo-uri (pip install mongomock)")
+    return mongomock.MongoClient()[BENCHMARK_DATABASE][name]
+
+
+def mongo_stats(writes):
+    write_seconds = sum(writes['latencies'])
+    return {
+        'batches': writes['batches'],
+        'upserted': writes['upserted'],
+        'failed': writes['failed'],
+        'write_seconds': write_seconds,
+        'docs_per_sec': (writes['upserted'] + writes['matched']) / write_seconds if write_seconds else None,
+        'batch_p50_ms': (scraping2.percentile(writes['latencies'], 50) or 0) * 1000,
+        'batch_p99_ms': (scraping2.percentile(writes['latencies'], 99) or 0) * 1000,
+    }
+
+
+def run_case(server_url, source, size, mongo_uri=None, processes=None, export_dir=None):
+    # Exécuté dans un processus neuf : le pic RSS ne mesure que ce cas ;
+    # export_dir : écriture Parquet/JSONL à la place de MongoDB
+    collection = open_collection(mongo_uri, f"publications_{source}")
+    collection.drop()
+    sinks = scraping2.export_sinks(os.path.join(export_dir, f"{source}_{size}")) if export_dir else ()
+    scraper = BenchmarkScraper(
+        f"{server_url}/{size}",
+        ncbi_api_key=None,
+        rate_limits=dict.fromkeys(FIXTURE_HOSTS, UNLIMITED_RATE),
+        entity_cache=scraping2.EntityCache(None),
+        mongo_collection=collection,
+        response_cache=False,
+        checkpoints=False,
+        sinks=sinks,
+        mongo=not export_dir,
+        config=scraping2.ScraperConfig(log_file=None, log_level=logging.WARNING),
+    )
+    baseline_rss = peak_rss_mb()
+    try:
+        summary = scraper.run_pipeline(
+            BENCHMARK_QUERY, [source], max_results={source: size}, email=BENCHMARK_EMAIL, processes=processes
+        )
+    finally:
+        scraper.close()
+    records = summary['total']
+    return {
+        'source': source,
+        'size': size,
+        'records': records,
+        'elapsed': summary['elapsed'],
+        'records_per_sec': records / summary['elapsed'] if summary['elapsed'] else None,
+        'stages': {
+            name: {'processed': stage['processed'], 'errors': stage['errors'],
+                   'p50_ms': stage['p50'] * 1000 if stage['p50'] is not None else None,
+                   'p99_ms': stage['p99'] * 1000 if stage['p99'] is not None else None}
+            for name, stage in summary['stages'].items()
+        },
+        'baseline_rss_mb': baseline_rss,
+        'peak_rss_mb': peak_rss_mb(),
+        'mongo': None if export_dir else mongo_stats(scraper.writer.stats),
+        'export': {sink.name: dict(sink.stats) for sink in sinks},
+        'requests': summary['hosts'],
+        'metrics': scraper.metrics.snapshot(),
+    }
+
+def run_benchmark(sources, sizes, mongo_uri=None, processes=None, export_dir=None):
+    server = start_fixture_server()
+    server_url = f"http://127.0.0.1:{server.server_address[1]}"
+    results = []
+    try:
+        for size in sizes:
+            for source in sources:
+                context = multiprocessing.get_context(scraping2.PROCESS_START_METHOD)
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    result = executor.submit(
+                        run_case, server_url, source, size, mongo_uri, processes, export_dir
+                    ).result()
+                results.append(result)
+                logging.info(
+                    f"{source} x {size}: {result['records']} records, {result['records_per_sec'] or 0:.0f} records/s, "
+                    f"peak RSS {result['peak_rss_mb'] or 0:.0f} MB"
+                )
+    finally:
+        server.shutdown()
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mongo': None if export_dir else mongo_uri or 'mongomock',
+            'export_dir': export_dir,
+            'processes': processes,
+            'sizes': sizes,
+            'sources': sources,
+        },
+        'results': results,
+    }
+
+
+# ------------------- EXECUTION -------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark of AcademicScraper against local fixtures")
+    parser.add_argument('--sources', nargs='+', default=BENCHMARK_SOURCES, choices=BENCHMARK_SOURCES)
+    parser.add_argument('--sizes', nargs='+', type=int, default=BENCHMARK_SIZES)
+    parser.add_argument('--mongo-uri', help="MongoDB to write to (default: in-memory mongomock)")
+    parser.add_argument('--processes', type=int, help="parse/NER in a pool of N processes")
+    parser.add_argument('--export-dir', help="write Parquet/JSONL files there instead of MongoDB")
+    parser.add_argument('--output', help="JSON results file (default: stdout)")
+    args = parser.parse_args()
+    scraping2.configure_logging(None)
+
+    report = run_benchmark(args.sources, args.sizes, args.mongo_uri, args.processes, args.export_dir)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        logging.info(f"Benchmark results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
@@ -1,28 +1,51 @@
 import requests
 from bs4 import BeautifulSoup
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
+import os
 import time
 import random
-import spacy
+from scraping2 import iter_pubmed_records, parse_arxiv, parse_openalex
 
-# Configuration du modèle spaCy
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Téléchargement du modèle spaCy...")
-    spacy.cli.download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+# Configuration du modèle spaCy (seule la NER est utilisée), chargé à la première extraction
+NER_MODEL = "en_core_web_sm"
+NER_DISABLED_COMPONENTS = ["parser", "tagger", "attribute_ruler", "lemmatizer", "senter"]
+NER_BATCH_SIZE = 64
+_nlp = None
 
-# Configuration MongoDB
-client = MongoClient('localhost', 27017)
-db = client['usms']
-collection = db['test']
+# Configuration MongoDB, connexion ouverte au premier enregistrement
+MONGO_HOST = 'localhost'
+MONGO_PORT = 27017
+MONGO_DATABASE = 'usms'
+MONGO_COLLECTION = 'test'
+MONGO_BATCH_SIZE = 1000
+_collection = None
 
-def extract_entities(text):
-    """Extrait les entités nommées avec spaCy"""
-    if not text:
-        return {'auteurs': [], 'institutions': [], 'concepts': [], 'ecoles': []}
-    doc = nlp(text)
+# Configuration NCBI E-utilities
+NCBI_API_KEY = os.environ.get('NCBI_API_KEY')
+NCBI_EFETCH_BATCH_SIZE = 500
+
+def get_nlp():
+    """Charge le modèle spaCy une seule fois par processus (et l'importe à ce moment-là)"""
+    global _nlp
+    if _nlp is None:
+        import spacy
+        try:
+            _nlp = spacy.load(NER_MODEL, disable=NER_DISABLED_COMPONENTS)
+        except OSError:
+            print("Téléchargement du modèle spaCy...")
+            spacy.cli.download(NER_MODEL)
+            _nlp = spacy.load(NER_MODEL, disable=NER_DISABLED_COMPONENTS)
+    return _nlp
+
+def get_collection():
+    """Ouvre la connexion MongoDB au premier appel"""
+    global _collection
+    if _collection is None:
+        _collection = MongoClient(MONGO_HOST, MONGO_PORT)[MONGO_DATABASE][MONGO_COLLECTION]
+    return _collection
+
+def _entities_from_doc(doc):
     return {
         'auteurs': [ent.text for ent in doc.ents if ent.label_ == 'PERSON'],
         'institutions': [ent.text for ent in doc.ents if ent.label_ == 'ORG'],
@@ -30,6 +53,46 @@ def extract_entities(text):
         'ecoles': [ent.text for ent in doc.ents if ent.text.lower() in ['école', 'collège']]
     }
 
+def extract_entities(text):
+    """Extrait les entités nommées avec spaCy"""
+    return extract_entities_batch([text])[0]
+
+def extract_entities_batch(texts, batch_size=NER_BATCH_SIZE, n_process=1):
+    """Extrait les entités d'une liste de textes par lots avec nlp.pipe"""
+    results = [{'auteurs': [], 'institutions': [], 'concepts': [], 'ecoles': []} for _ in texts]
+    indexed = [(i, text) for i, text in enumerate(texts) if text]
+    if not indexed:
+        return results
+    docs = get_nlp().pipe((text for _, text in indexed), batch_size=batch_size, n_process=n_process)
+    for (i, _), doc in zip(indexed, docs):
+        results[i] = _entities_from_doc(doc)
+    return results
+
+def annotate_entities(results, batch_size=NER_BATCH_SIZE, n_process=1):
+    """Ajoute le champ 'entities' à chaque publication à partir de son résumé"""
+    texts = [entry.get('abstract') or '' for entry in results]
+    for entry, entities in zip(results, extract_entities_batch(texts, batch_size, n_process)):
+        entry['entities'] = entities
+    return results
+
+def save_results(results, batch_size=MONGO_BATCH_SIZE):
+    """Upsert groupé (bulk_write non ordonné) des publications, dédupliquées par titre"""
+    collection = get_collection()
+    collection.create_index('title')
+    for i in range(0, len(results), batch_size):
+        operations = [
+            UpdateOne({'title': entry.title}, {'$set': entry.to_bson()}, upsert=True)
+            for entry in results[i:i + batch_size]
+        ]
+        start = time.perf_counter()
+        try:
+            result = collection.bulk_write(operations, ordered=False).bulk_api_result
+        except BulkWriteError as e:
+            result = e.details
+            print(f"Erreur MongoDB: {len(result.get('writeErrors', []))} écritures échouées")
+        print(f"Lot de {len(operations)} publications écrit en {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"(insérées {result.get('nUpserted', 0)}, existantes {result.get('nMatched', 0)})")
+
 def openalex_extractor(query, email, max_results=500):
     url = "https://api.openalex.org/works"
     params = {
@@ -46,32 +109,15 @@ def openalex_extractor(query, email, max_results=500):
             response.raise_for_status()  # Check for HTTP errors
             data = response.json()
             
-            for work in data.get('results', []):
-                try:
-                    authorships = work.get('authorships', [])
-                    authors = [a.get('author', {}).get('display_name', 'Auteur inconnu') for a in authorships]
-                    primary_location = work.get('primary_location', {})
-                    source = primary_location.get('source', {})
-                    
-                    entry = {
-                        'title': work.get('title', 'Titre inconnu'),
-                        'authors': authors,
-                        'year': int(work.get('publication_date', '0000')[:4]) if work.get('publication_date') else None,
-                        'journal': source.get('display_name', 'Journal inconnu'),
-                        'abstract': work.get('abstract', ''),
-                        'link': work.get('doi', ''),
-                        'keywords': [kw.get('display_name', '') for kw in work.get('keywords', [])],
-                        'entities': extract_entities(work.get('abstract', ''))
-                    }
-                    results.append(entry)
-                except Exception as e:
-                    print(f"Erreur traitement entrée OpenAlex: {e}")
+            # Conversion partagée avec scraping2 (Publication normalisée)
+            results.extend(parse_openalex(data.get('results', [])))
             
             if len(results) >= max_results:
                 break
         
         if results:
-            collection.insert_many(results)
+            annotate_entities(results)
+            save_results(results)
             print(f"{len(results)} publications OpenAlex insérées.")
             
     except Exception as e:
@@ -79,56 +125,40 @@ def openalex_extractor(query, email, max_results=500):
     
     return results
 
-def pubmed_scraper(query, max_results=500):
+def pubmed_scraper(query, max_results=500, batch_size=NCBI_EFETCH_BATCH_SIZE, api_key=NCBI_API_KEY):
     base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+    api_params = {'api_key': api_key} if api_key else {}
     results = []
     
     try:
-        # Recherche
-        esearch = f"{base_url}esearch.fcgi?db=pubmed&term={query}&retmax={max_results}"
-        response = requests.get(esearch, timeout=10)
+        # Recherche : les IDs restent sur le serveur d'historique NCBI (WebEnv / query_key)
+        search_params = {'db': 'pubmed', 'term': query, 'usehistory': 'y', 'retmax': 0, **api_params}
+        response = requests.get(f"{base_url}esearch.fcgi", params=search_params, timeout=10)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'lxml-xml')
-        ids = [id.text for id in soup.find_all('Id')]
-        
-        # Récupération des détails
-        efetch = f"{base_url}efetch.fcgi?db=pubmed&id={','.join(ids)}&retmode=xml"
-        details_response = requests.get(efetch, timeout=10)
-        details_response.raise_for_status()
-        details_soup = BeautifulSoup(details_response.text, 'lxml-xml')
+        web_env = soup.find('WebEnv').text
+        query_key = soup.find('QueryKey').text
+        total = min(int(soup.find('Count').text), max_results)
         
-        for article in details_soup.find_all('PubmedArticle'):
-            try:
-                title = article.find('ArticleTitle').text if article.find('ArticleTitle') else 'Sans titre'
-                
-                authors = []
-                for auth in article.find_all('Author'):
-                    last_name = auth.find('LastName').text if auth.find('LastName') else ''
-                    fore_name = auth.find('ForeName').text if auth.find('ForeName') else ''
-                    authors.append(f"{last_name} {fore_name}".strip())
-                
-                pub_date = article.find('PubDate')
-                year = pub_date.Year.text if pub_date and pub_date.Year else None
-                journal = article.find('Journal').Title.text if article.find('Journal') else ''
-                
-                abstract = ' '.join([t.text for t in article.find_all('AbstractText')])
-                pmid = article.find('PMID').text if article.find('PMID') else ''
-                
-                results.append({
-                    'title': title,
-                    'authors': authors,
-                    'year': int(year) if year else None,
-                    'journal': journal,
-                    'abstract': abstract,
-                    'link': f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" if pmid else '',
-                    'keywords': [kw.text for kw in article.find_all('Keyword')],
-                    'entities': extract_entities(abstract)
-                })
-            except Exception as e:
-                print(f"Erreur traitement article PubMed: {e}")
+        # Récupération des détails par lots (POST), paginée avec retstart
+        for retstart in range(0, total, batch_size):
+            fetch_data = {
+                'db': 'pubmed',
+                'WebEnv': web_env,
+                'query_key': query_key,
+                'retstart': retstart,
+                'retmax': min(batch_size, total - retstart),
+                'retmode': 'xml',
+                **api_params
+            }
+            details_response = requests.post(f"{base_url}efetch.fcgi", data=fetch_data, timeout=60)
+            details_response.raise_for_status()
+            # Même parseur que scraping2 (lecture en flux, Publication normalisée)
+            results.extend(iter_pubmed_records(details_response.content))
         
         if results:
-            collection.insert_many(results)
+            annotate_entities(results)
+            save_results(results)
             print(f"{len(results)} publications PubMed insérées.")
             
     except Exception as e:
@@ -144,30 +174,11 @@ def arxiv_scraper(query, max_results=500):
     try:
         response = requests.get(url, params=params, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml-xml')
-        
-        for entry in soup.find_all('entry'):
-            try:
-                title = entry.title.text.strip() if entry.title else 'Sans titre'
-                authors = [a.find('name').text for a in entry.find_all('author') if a.find('name')]
-                published = entry.published.text[:4] if entry.published else None
-                abstract = entry.summary.text.strip() if entry.summary else ''
-                
-                results.append({
-                    'title': title,
-                    'authors': authors,
-                    'year': int(published) if published else None,
-                    'journal': 'ArXiv',
-                    'abstract': abstract,
-                    'link': entry.id.text if entry.id else '',
-                    'keywords': [cat['term'] for cat in entry.find_all('category') if cat.has_attr('term')],
-                    'entities': extract_entities(abstract)
-                })
-            except Exception as e:
-                print(f"Erreur traitement entrée ArXiv: {e}")
+        results.extend(parse_arxiv(response.text))
         
         if results:
-            collection.insert_many(results)
+            annotate_entities(results)
+            save_results(results)
             print(f"{len(results)} publications ArXiv insérées.")
             
     except Exception as e:
@@ -185,9 +196,7 @@ if __name__ == "__main__":
     email = "anas.battas@usms.ac.ma"
     
     try:
-        # Delay the script for more than 5 minutes
         print("Démarrage de l'extraction...")
-        time.sleep(310)  # 5 minutes and 10 seconds delay
 
         # Extract data from sources
         openalex_results = openalex_extractor(query, email, 500)
@@ -199,7 +208,7 @@ if __name__ == "__main__":
         print(f"Total publications stockées avec succès : {total}")
         
         # Affichage d'un exemple
-        sample = collection.find_one()
+        sample = get_collection().find_one()
         if sample:
             print("\nExemple de document stocké :")
             for key, value in sample.items():
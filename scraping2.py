@@ -1,512 +1,3327 @@
 import requests
 from bs4 import BeautifulSoup
-from pymongo import MongoClient
+from lxml import etree
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+import abc
 import time
 import random
-import spacy
+import re
+import unicodedata
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import socket
+import hashlib
+import importlib.metadata
+import inspect
+import operator
+import zlib
+import gzip
+import io
+import math
+import sqlite3
+import queue
+import threading
+import bisect
+import cProfile
+import pstats
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from urllib.parse import quote, urlsplit
+
+try:
+    import pyinstrument
+except ImportError:  # profileur optionnel, cProfile sinon
+    pyinstrument = None
 
 # ------------------- CONFIGURATION -------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.FileHandler("academic_scraper.log"), logging.StreamHandler()]
+# Rien n'est créé à l'import : journal, client MongoDB et modèle spaCy le sont à la première
+# utilisation (voir ScraperConfig et get_nlp)
+LOG_FILE = "academic_scraper.log"
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+# Configuration MongoDB
+MONGO_URI = "mongodb://localhost:27017/"
+MONGO_DATABASE = "academic_database44"
+MONGO_COLLECTION = "publications"
+CHECKPOINTS_COLLECTION = "crawl_checkpoints"
+TASKS_COLLECTION = "crawl_tasks"
+RATE_LIMITS_COLLECTION = "host_rate_limits"
+
+# Configuration spaCy : seule la NER est utilisée, le reste du pipeline est désactivé
+NER_MODEL = "en_core_web_sm"
+NER_DISABLED_COMPONENTS = ["parser", "tagger", "attribute_ruler", "lemmatizer", "senter"]
+NER_BATCH_SIZE = 64
+NER_CACHE_PATH = "ner_cache.sqlite"
+NER_CACHE_MEMORY_ITEMS = 10000
+NER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+NER_CACHE_BUSY_TIMEOUT = 30.0  # secondes d'attente d'un autre processus qui écrit le fichier
+NER_CACHE_TOUCH_BATCH = 1000  # dates d'utilisation écrites par lots, hors du chemin de lecture
+NER_CACHE_EVICT_CHUNK = 1000
+
+# Déduplication : au-delà de ce nombre de titres, filtre de Bloom au lieu d'un set
+DEDUP_BLOOM_THRESHOLD = 2_000_000
+DEDUP_BLOOM_ERROR_RATE = 0.001
+
+# Liaison des enregistrements : MinHash sur les 4-grammes de caractères du titre,
+# 16 bandes de 4 lignes pour le LSH, similarité vérifiée sur la signature
+MINHASH_PERMUTATIONS = 64
+MINHASH_SEED = 20240101
+LSH_BANDS = 16
+TITLE_SHINGLE_SIZE = 4
+TITLE_SIMILARITY_THRESHOLD = 0.8
+LINK_MIN_TITLE_LENGTH = 25
+
+# Écritures MongoDB groupées
+MONGO_BATCH_SIZE = 1000
+MONGO_FLUSH_INTERVAL = 5.0  # secondes : durée maximale d'un morceau de save_stream avant écriture
+
+# Exports fichiers (analytique) : Parquet partitionné par source / année et JSON Lines compressé
+EXPORT_DIR = os.environ.get('SCRAPER_EXPORT_DIR')
+EXPORT_ONLY = os.environ.get('SCRAPER_EXPORT_ONLY') == '1'  # aucune écriture MongoDB
+EXPORT_CHUNK_ROWS = 10000  # lignes par groupe de lignes des fichiers Parquet regroupés
+EXPORT_PARQUET_COMPRESSION = 'zstd'
+
+# Configuration globale
+NCBI_API_KEY = os.environ.get("NCBI_API_KEY")
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0",
+]
+
+# Cache HTTP sur disque : durée de vie par hôte ou préfixe d'URL (secondes)
+HTTP_CACHE_PATH = "http_cache.sqlite"
+HTTP_CACHE_TTLS = {
+    'eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi': 3600,  # le WebEnv expire côté NCBI
+    'eutils.ncbi.nlm.nih.gov': 7 * 86400,
+    'export.arxiv.org': 86400,
+    'api.openalex.org': 86400,
+}
+HTTP_CACHE_DEFAULT_TTL = 86400
+HTTP_CACHE_IGNORED_PARAMS = {'api_key', 'mailto'}  # n'influencent pas le contenu renvoyé
+
+# Limites de débit par hôte : (requêtes, période en secondes)
+HOST_RATE_LIMITS = {
+    'export.arxiv.org': (1, 3),  # arXiv: 1 requête toutes les 3 s
+    'eutils.ncbi.nlm.nih.gov': (3, 1),  # NCBI: 3 requêtes/s sans clé API
+    'api.openalex.org': (10, 1),  # OpenAlex polite pool (mailto)
+}
+NCBI_API_KEY_RATE_LIMIT = (10, 1)  # NCBI: 10 requêtes/s avec clé API
+NCBI_EFETCH_BATCH_SIZE = 500
+NCBI_CONCURRENCY = 3  # lots efetch en vol simultanément (le débit reste borné par le seau NCBI)
+ARXIV_PAGE_SIZE = 200
+OPENALEX_PAGE_SIZE = 200  # maximum de l'API (per_page)
+GOOGLE_SCHOLAR_PAGE_SIZE = 10
+# IDs par appel efetch rettype=uilist sur le serveur d'historique (mode lot : IDs récupérés pour être
+# partagés) ; esearch seul s'arrête aux 10 000 premiers résultats
+NCBI_ID_BATCH_SIZE = 10000
+
+# Mode lot : requêtes traitées en parallèle dans un même processus
+JOB_CONCURRENCY = 2
+
+# Workers distribués : tâches (source, requête, page / curseur / lot d'IDs) louées dans MongoDB
+TASK_LEASE_SECONDS = 120  # une tâche non prolongée avant ce délai est remise en file
+TASK_HEARTBEAT_SECONDS = 30
+TASK_MAX_ATTEMPTS = 5
+TASK_POLL_INTERVAL = 2.0  # secondes entre deux tentatives quand la file est vide
+
+# Pipeline fetch -> parse -> NER -> stockage : workers par étape et taille des files
+PIPELINE_WORKERS = {'parse': 2, 'ner': 1, 'store': 1}
+PIPELINE_QUEUE_SIZE = 8
+PIPELINE_LATENCY_SAMPLES = 10000  # durées conservées par étape pour les percentiles
+
+# Instrumentation : histogrammes de durées (s) et de tailles de lots, export JSON / Prometheus
+METRICS_PREFIX = 'scraper'
+METRICS_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+METRICS_SIZE_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+METRICS_JSON_PATH = "scraper_metrics.json"
+METRICS_PORT = int(os.environ.get('SCRAPER_METRICS_PORT') or 0) or None
+PROFILE_TOP = 40  # lignes du rapport cProfile
+PROCESS_START_METHOD = 'spawn'  # pas de fork d'un processus qui a déjà des threads réseau
+DEFAULT_RATE_LIMIT = (1, 2)
+
+# Contrôle adaptatif : concurrence par hôte (AIMD), Retry-After et disjoncteur
+ADAPTIVE_INITIAL_CONCURRENCY = 2
+ADAPTIVE_MAX_CONCURRENCY = 8
+RETRY_AFTER_MAX = 120  # secondes
+THROTTLE_STATUSES = (403, 429, 503)
+BREAKER_FAILURE_THRESHOLD = 5  # échecs consécutifs avant ouverture
+BREAKER_COOLDOWN = 300  # secondes avant un nouvel essai
+BREAKER_MAX_COOLDOWN = 3600
+
+# ------------------- FONCTIONS UTILITAIRES -------------------
+def get_random_header():
+    return {
+        'User-Agent': random.choice(USER_AGENTS),
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Referer': 'https://www.google.com/',
+        'DNT': str(random.randint(0, 1))
+    }
+
+def host_of(url):
+    return urlsplit(url).netloc.lower()
+
+def ensure_unique_index(collection, field):
+    try:
+        # Index partiel : les documents sans ce champ n'entrent pas en conflit
+        collection.create_index(field, unique=True, partialFilterExpression={field: {'$exists': True}})
+    except Exception as e:
+        logging.warning(f"Unique index on '{field}' unavailable ({str(e)}), using a regular index")
+        collection.create_index(field)
+
+def percentile(values, q):
+    # Percentile par rang le plus proche ; None si aucune mesure
+    values = sorted(values)
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, math.ceil(q / 100 * len(values)) - 1))]
+
+def configure_logging(log_file=LOG_FILE, level=logging.INFO):
+    # Sans effet si la journalisation est déjà configurée (application hôte, appel précédent)
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.insert(0, logging.FileHandler(log_file))
+    logging.basicConfig(level=level, format=LOG_FORMAT, handlers=handlers)
+
+_models = {}
+_models_lock = threading.Lock()
+
+def get_nlp(name=NER_MODEL):
+    # Chargé une seule fois par processus, à la première extraction d'entités ;
+    # spaCy n'est importé qu'ici (plusieurs secondes)
+    with _models_lock:
+        if name not in _models:
+            import spacy
+            try:
+                _models[name] = spacy.load(name, disable=NER_DISABLED_COMPONENTS)
+            except OSError:
+                spacy.cli.download(name)
+                _models[name] = spacy.load(name, disable=NER_DISABLED_COMPONENTS)
+        return _models[name]
+
+def model_id(name=NER_MODEL):
+    # Identifiant versionné du modèle sans le charger (métadonnées du paquet installé)
+    try:
+        return f"{name}-{importlib.metadata.version(name)}"
+    except importlib.metadata.PackageNotFoundError:
+        meta = get_nlp(name).meta
+        return f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}"
+
+def bounded_map(executor, fn, items, window):
+    # Comme executor.map, dans l'ordre, mais avec au plus `window` tâches en vol
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def chunked(items, size, interval=None):
+    # Regroupe un flux en listes de `size` éléments (ou moins si `interval` secondes sont écoulées)
+    chunk, started = [], time.monotonic()
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size or (interval is not None and time.monotonic() - started >= interval):
+            yield chunk
+            chunk, started = [], time.monotonic()
+    if chunk:
+        yield chunk
+
+def _entities_from_doc(doc):
+    entities = {}
+    for ent in doc.ents:
+        texts = entities.setdefault(ent.label_, [])
+        if ent.text not in texts:
+            texts.append(ent.text)
+    return entities
+
+def extract_entities(text, model=NER_MODEL):
+    return extract_entities_batch([text], model=model)[0]
+
+def extract_entities_batch(texts, batch_size=NER_BATCH_SIZE, n_process=1, cache=None, model=NER_MODEL):
+    results = [{} for _ in texts]
+    # Un même texte (ou déjà en cache) ne passe qu'une fois dans spaCy
+    pending = OrderedDict()
+    for i, text in enumerate(texts):
+        if not text:
+            continue
+        key = cache.key(text) if cache is not None else text
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                results[i] = cached
+                continue
+        pending.setdefault(key, (text, []))[1].append(i)
+
+    if not pending:
+        return results
+    docs = get_nlp(model).pipe((text for text, _ in pending.values()), batch_size=batch_size, n_process=n_process)
+    for (key, (_, indices)), doc in zip(pending.items(), docs):
+        entities = _entities_from_doc(doc)
+        if cache is not None:
+            cache.put(key, entities)
+        for i in indices:
+            results[i] = entities
+    return results
+
+def annotate_entities(records, batch_size=NER_BATCH_SIZE, n_process=1, cache=None, model=NER_MODEL):
+    # Seuls les enregistrements (Publication) avec un résumé reçoivent des entités
+    targets = [record for record in records if record.abstract]
+    texts = [record.abstract for record in targets]
+    for record, entities in zip(targets, extract_entities_batch(texts, batch_size, n_process, cache, model)):
+        record.entities = entities
+    return records
+
+# ------------------- INSTRUMENTATION -------------------
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # dernier compteur : +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total, result = 0, []
+        for bound, count in zip((*self.buckets, math.inf), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        # Borne supérieure du bucket qui contient le quantile
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound if bound != math.inf else self.buckets[-1]
+
+
+class Metrics:
+    # Compteurs, jauges et histogrammes étiquetés, exportés en texte Prometheus ou en JSON.
+    # Les collecteurs fournissent à l'export des compteurs déjà tenus ailleurs (caches, hôtes).
+    def __init__(self, prefix=METRICS_PREFIX, buckets=METRICS_LATENCY_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def add_gauge(self, name, delta, **labels):
+        # Variation d'une jauge (+1 / -1) : plusieurs producteurs peuvent tenir la même valeur
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def gauge(self, name, **labels):
+        with self._lock:
+            return self._gauges.get(self._key(name, labels), 0)
+
+    def observe(self, name, value, buckets=None, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets or self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def total(self, name):
+        # Somme d'un compteur sur toutes ses étiquettes
+        with self._lock:
+            return sum(value for (counter, _), value in self._counters.items() if counter == name)
+
+    def add_collector(self, collect):
+        # collect() renvoie des tuples (nom, étiquettes, valeur)
+        self._collectors.append(collect)
+
+    def _collect(self):
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {key: (h.cumulative(), h.sum, h.count, h.quantile(0.5), h.quantile(0.99))
+                          for key, h in self._histograms.items()}
+        for collect in self._collectors:
+            for name, labels, value in collect():
+                counters[self._key(name, labels)] = value
+        return counters, gauges, histograms
+
+    def snapshot(self):
+        counters, gauges, histograms = self._collect()
+        snapshot = {'counters': {}, 'gauges': {}, 'histograms': {}}
+        for (name, labels), value in sorted(counters.items()):
+            snapshot['counters'].setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        for (name, labels), value in sorted(gauges.items()):
+            snapshot['gauges'].setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        for (name, labels), (cumulative, total, count, p50, p99) in sorted(histograms.items()):
+            snapshot['histograms'].setdefault(name, []).append({
+                'labels': dict(labels), 'count': count, 'sum': total, 'p50': p50, 'p99': p99,
+                'buckets': {('+Inf' if bound == math.inf else str(bound)): n for bound, n in cumulative},
+            })
+        return snapshot
+
+    def prometheus(self):
+        counters, gauges, histograms = self._collect()
+
+        def labels_text(labels, **extra):
+            pairs = [*labels, *extra.items()]
+            if not pairs:
+                return ''
+            escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+            return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+        lines, typed = [], set()
+        for kind, values in (('counter', counters), ('gauge', gauges)):
+            for (name, labels), value in sorted(values.items()):
+                metric = f"{self.prefix}_{name}"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} {kind}")
+                    typed.add(metric)
+                lines.append(f"{metric}{labels_text(labels)} {value}")
+        for (name, labels), (cumulative, total, count, _, _) in sorted(histograms.items()):
+            metric = f"{self.prefix}_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            for bound, n in cumulative:
+                lines.append(f"{metric}_bucket{labels_text(labels, le='+Inf' if bound == math.inf else bound)} {n}")
+            lines.append(f"{metric}_sum{labels_text(labels)} {total}")
+            lines.append(f"{metric}_count{labels_text(labels)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path=METRICS_JSON_PATH):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def serve(self, port, host='127.0.0.1'):
+        # /metrics (texte Prometheus) et /metrics.json, servis par un thread démon
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = metrics.prometheus(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(metrics.snapshot()), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                body = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+        logging.info(f"Metrics served on http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+# ------------------- MODÈLE DE PUBLICATION -------------------
+_YEAR = re.compile(r'\d{4}')
+
+def _year(value):
+    # Année entière, quelle que soit la forme reçue (entier, texte HTML, date ISO)
+    if value is None or isinstance(value, int):
+        return value
+    match = _YEAR.search(str(value))
+    return int(match.group(0)) if match else None
+
+class Publication(MutableMapping):
+    # Enregistrement normalisé, à slots (pas de __dict__ par instance). Il se lit aussi comme un
+    # dict, ce qui permet à la liaison de traiter publications et documents MongoDB de la même façon.
+    # Types : title, source : str ; authors, keywords : list de str ; year : int ; journal,
+    # abstract, link, doi, pmid, fingerprint : str ; entities : dict.
+    # None : champ non fourni par la source, absent du document BSON.
+    FIELDS = ('title', 'authors', 'year', 'journal', 'abstract', 'link', 'doi', 'pmid', 'keywords',
+              'source', 'entities', 'fingerprint')
+    __slots__ = FIELDS
+    _FIELD_SET = frozenset(FIELDS)
+    _values = operator.attrgetter(*FIELDS)
+
+    def __init__(self, title, authors, year, journal, abstract, link, doi, pmid, keywords, source,
+                 entities=None, fingerprint=None):
+        self.title = title
+        self.authors = authors
+        self.year = year
+        self.journal = journal
+        self.abstract = abstract
+        self.link = link
+        self.doi = doi
+        self.pmid = pmid
+        self.keywords = keywords
+        self.source = source
+        self.entities = entities
+        self.fingerprint = fingerprint
+
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        return default
+
+    def __contains__(self, key):
+        return key in self._FIELD_SET and getattr(self, key) is not None
+
+    def __setitem__(self, key, value):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        setattr(self, key, None)
+
+    def __iter__(self):
+        return (field for field, value in zip(self.FIELDS, self._values(self)) if value is not None)
+
+    def __len__(self):
+        return sum(value is not None for value in self._values(self))
+
+    def __reduce__(self):
+        # Pickle compact (pool de processus) : les valeurs dans l'ordre de FIELDS
+        return Publication, self._values(self)
+
+    def __repr__(self):
+        return f"Publication({self.to_bson()!r})"
+
+    def to_bson(self):
+        # Document prêt pour MongoDB : champs renseignés uniquement
+        return {field: value for field, value in zip(self.FIELDS, self._values(self)) if value is not None}
+
+
+def to_bson(record):
+    return record.to_bson() if isinstance(record, Publication) else dict(record)
+
+def normalize_publication(source, title=None, authors=None, year=None, journal=None, abstract=None,
+                          link=None, doi=None, pmid=None, keywords=None):
+    # Point de passage unique de tous les parseurs : types homogènes, chaînes vides -> None,
+    # noms de source, revues et mots-clés internés (partagés par tous les enregistrements)
+    if isinstance(authors, str):
+        # Google Scholar : « A Auteur, B Auteur - Revue, 2020 - éditeur »
+        authors = authors.split(' - ', 1)[0].split(',')
+    journal = journal.strip() if journal else None
+    doi = doi.strip() if doi else None
+    return Publication(
+        (title or '').strip() or 'Untitled',
+        [name.strip() for name in authors if name and name.strip()] if authors else [],
+        _year(year),
+        sys.intern(journal) if journal else None,
+        abstract or None,
+        link or None,
+        doi or None,
+        str(pmid) if pmid else None,
+        [sys.intern(str(keyword)) for keyword in keywords if keyword] if keywords is not None else None,
+        sys.intern(source),
+    )
+
+
+# ------------------- PARSING PUBMED / MEDLINE -------------------
+# XPath compilés une seule fois, évalués sur chaque article ; chaînes simples (smart_strings=False) :
+# une chaîne lxml garde une référence vers son élément, donc vers l'arbre entier
+_PUBMED_TITLE = etree.XPath('(.//ArticleTitle)[1]')
+_PUBMED_AUTHORS = etree.XPath('.//Author[LastName and ForeName]')
+_PUBMED_AUTHOR_NAME = etree.XPath('concat(LastName, " ", ForeName)', smart_strings=False)
+_PUBMED_YEAR = etree.XPath('string((.//PubDate)[1]/Year)', smart_strings=False)
+_PUBMED_JOURNAL = etree.XPath('string((.//Journal)[1]/Title)', smart_strings=False)
+_PUBMED_ABSTRACT = etree.XPath('.//AbstractText')
+_PUBMED_PMID = etree.XPath('string((.//PMID)[1])', smart_strings=False)
+_PUBMED_KEYWORDS = etree.XPath('.//Keyword')
+_PUBMED_DOI = etree.XPath(
+    'string((PubmedData/ArticleIdList/ArticleId[@IdType="doi"] | .//Article/ELocationID[@EIdType="doi"])[1])',
+    smart_strings=False,
 )
+_TEXT = etree.XPath('string()', smart_strings=False)
+
+def _pubmed_record(article, source):
+    title = _PUBMED_TITLE(article)
+    pmid = _PUBMED_PMID(article)
+    return normalize_publication(
+        source,
+        title=_TEXT(title[0]) if title else None,
+        authors=[_PUBMED_AUTHOR_NAME(author) for author in _PUBMED_AUTHORS(article)],
+        year=_PUBMED_YEAR(article),
+        journal=_PUBMED_JOURNAL(article),
+        abstract=' '.join(_TEXT(part) for part in _PUBMED_ABSTRACT(article)),
+        link=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" if pmid else None,
+        doi=_PUBMED_DOI(article),
+        pmid=pmid,
+        keywords=[_TEXT(keyword) for keyword in _PUBMED_KEYWORDS(article)],
+    )
+
+def parse_pubmed(content):
+    return iter_pubmed_records(content, 'PubmedArticle', 'PubMed')
+
+def parse_medline(content):
+    return iter_pubmed_records(content, 'MedlineCitation', 'Medline')
+
+def iter_pubmed_records(content, tag='PubmedArticle', source='PubMed'):
+    # Lecture en flux : chaque article est libéré dès qu'il a été converti. Un MedlineCitation
+    # inclus dans un PubmedArticle est lu à la fin de celui-ci : le DOI est dans PubmedData, son frère
+    events = etree.iterparse(io.BytesIO(content), events=('end',), tag={tag, 'PubmedArticle'}, huge_tree=True)
+    for _, article in events:
+        parent = article.getparent()
+        if article.tag != 'PubmedArticle' and parent is not None and parent.tag == 'PubmedArticle':
+            continue
+        try:
+            yield _pubmed_record(article, source)
+        except Exception as e:
+            logging.error(f"{source} processing error: {str(e)}")
+        finally:
+            article.clear()
+            for element in (article, *article.iterancestors()):
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+
+# ------------------- PARSING OPENALEX -------------------
+# Seuls les champs lus par openalex_record sont demandés (paramètre select)
+OPENALEX_FIELDS = ['title', 'authorships', 'publication_date', 'primary_location',
+                   'abstract_inverted_index', 'doi', 'ids', 'keywords']
+OPENALEX_SELECT = ','.join(OPENALEX_FIELDS)
+
+def openalex_abstract(inverted_index):
+    # OpenAlex fournit le résumé sous forme d'index inversé {mot: [positions]}
+    if not inverted_index:
+        return ''
+    positions = [(position, word) for word, indexes in inverted_index.items() for position in indexes]
+    return ' '.join(word for _, word in sorted(positions))
+
+def openalex_record(work):
+    source = (work.get('primary_location') or {}).get('source') or {}
+    return normalize_publication(
+        'OpenAlex',
+        title=work.get('title'),
+        authors=[(a.get('author') or {}).get('display_name') for a in work.get('authorships') or []],
+        year=work.get('publication_date'),
+        journal=source.get('display_name', 'Unknown'),
+        abstract=openalex_abstract(work.get('abstract_inverted_index')),
+        link=work.get('doi'),
+        pmid=((work.get('ids') or {}).get('pmid') or '').rsplit('/', 1)[-1],
+        keywords=[kw.get('display_name') for kw in work.get('keywords') or []],
+    )
+
+
+def parse_openalex(works):
+    for work in works:
+        try:
+            yield openalex_record(work)
+        except Exception as e:
+            logging.error(f"OpenAlex processing error: {str(e)}")
+
+
+# ------------------- PARSING ARXIV / SCILIT -------------------
+def parse_arxiv(text):
+    soup = BeautifulSoup(text, 'lxml-xml')
+    for entry in soup.find_all('entry'):
+        try:
+            doi = entry.find('doi')
+            yield normalize_publication(
+                'arXiv',
+                title=entry.title.text if entry.title else None,
+                authors=[a.find('name').text for a in entry.find_all('author') if a.find('name')],
+                year=entry.published.text if entry.published else None,
+                journal='ArXiv',
+                abstract=entry.summary.text.strip() if entry.summary else None,
+                link=entry.id.text if entry.id else None,
+                doi=doi.text if doi else None,
+                keywords=[cat['term'] for cat in entry.find_all('category')],
+            )
+        except Exception as e:
+            logging.error(f"ArXiv processing error: {str(e)}")
+
+def parse_scilit(text):
+    for item in json.loads(text).get('results', []):
+        try:
+            yield normalize_publication(
+                'Scilit',
+                title=item.get('title'),
+                authors=[author.get('name') for author in item.get('authors', [])],
+                year=item.get('year'),
+                journal=item.get('journal'),
+                abstract=item.get('abstract'),
+                link=item.get('doi'),
+                keywords=item.get('keywords', []),
+            )
+        except Exception as e:
+            logging.error(f"Scilit processing error: {str(e)}")
+
+# ------------------- PARSING HTML -------------------
+def css_class(name):
+    # Équivalent XPath du sélecteur CSS .name (sans dépendre de cssselect)
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+class HtmlExtractor:
+    # Spécification déclarative d'une source HTML : un XPath pour les nœuds de résultat et un
+    # par champ, compilés une fois. Types de champ : 'text' (texte du premier nœud),
+    # 'texts' (texte de chaque nœud), 'attr' (valeur du premier attribut).
+    # Les résultats sans champ requis sont ignorés.
+    def __init__(self, source, items, fields, required=('title',)):
+        self.source = source
+        self.items = etree.XPath(items)
+        self.fields = [
+            (name, kind, etree.XPath(expression if kind == 'texts' else f"string(({expression})[1])",
+                                     smart_strings=False))
+            for name, (kind, expression) in fields.items()
+        ]
+        self.required = required
+
+    def __call__(self, text):
+        if not text:
+            return
+        root = etree.fromstring(text.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+        if root is None:
+            return
+        for node in self.items(root):
+            try:
+                record = {}
+                for name, kind, xpath in self.fields:
+                    if kind == 'texts':
+                        record[name] = [''.join(element.itertext()).strip() for element in xpath(node)]
+                    else:
+                        record[name] = xpath(node).strip()
+                if all(record[name] for name in self.required):
+                    yield normalize_publication(self.source, **record)
+            except Exception as e:
+                logging.error(f"{self.source} processing error: {str(e)}")
+
+def listing_extractor(source, item, title_tag, author_class):
+    # Springer, HAL, ResearchGate et CiteSeerX partagent la même structure de résultats
+    return HtmlExtractor(source, item, {
+        'title': ('text', f".//{title_tag}"),
+        'authors': ('texts', f".//span[{css_class(author_class)}]"),
+        'year': ('text', f".//span[{css_class('year')}]"),
+        'journal': ('text', f".//span[{css_class('journal')}]"),
+        'link': ('attr', './/a/@href'),
+    })
+
+parse_google_scholar = HtmlExtractor('Google Scholar', f"//div[{css_class('gs_ri')}]", {
+    'title': ('text', './/h3'),
+    'authors': ('text', f".//div[{css_class('gs_a')}]"),
+    'link': ('attr', './/a/@href'),
+})
+parse_springer = listing_extractor('Springer', f"//li[{css_class('result-item')}]", 'h2', 'authors')
+parse_hal = listing_extractor('HAL', f"//div[{css_class('record')}]", 'h2', 'author')
+parse_researchgate = listing_extractor('ResearchGate', f"//div[{css_class('publication-item')}]", 'h2', 'author')
+parse_citeseerx = listing_extractor('CiteSeerx', f"//div[{css_class('result')}]", 'h3', 'author')
+
+
+# Sources disponibles : nom -> fonction de parsing des pages renvoyées par AcademicScraper._fetch_<nom>
+SOURCES = {
+    'arxiv': parse_arxiv,
+    'openalex': parse_openalex,
+    'pubmed': parse_pubmed,
+    'scilit': parse_scilit,
+    'google_scholar': parse_google_scholar,
+    'springer': parse_springer,
+    'hal': parse_hal,
+    'medline': parse_medline,
+    'researchgate': parse_researchgate,
+    'citeseerx': parse_citeseerx,
+}
+
+
+# ------------------- CACHE NER -------------------
+class EntityCache:
+    # Deux niveaux : LRU en mémoire puis SQLite sur disque, borné en octets. Le fichier est
+    # partagé entre processus (mode WAL) : les transactions d'écriture restent courtes et une
+    # erreur SQLite compte comme un défaut de cache, jamais comme une erreur du pipeline.
+    def __init__(self, path=NER_CACHE_PATH, memory_items=NER_CACHE_MEMORY_ITEMS,
+                 max_bytes=NER_CACHE_MAX_BYTES, model=NER_MODEL):
+        self.model = model
+        self._model_id = None
+        self.path = path
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'errors': 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disk_bytes = 0
+        self._touched = {}
+
+    def _disk(self):
+        if self._conn is None and self.path:
+            conn = sqlite3.connect(self.path, timeout=NER_CACHE_BUSY_TIMEOUT, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(f"PRAGMA busy_timeout = {int(NER_CACHE_BUSY_TIMEOUT * 1000)}")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entities "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS entities_used ON entities (used)")
+                self._disk_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entities").fetchone()[0]
+                conn.commit()
+            except sqlite3.Error:
+                conn.close()  # nouvel essai au prochain accès
+                raise
+            self._conn = conn
+        return self._conn
+
+    @property
+    def model_id(self):
+        if self._model_id is None:
+            self._model_id = model_id(self.model)
+        return self._model_id
+
+    def key(self, text):
+        normalized = ' '.join(text.split())
+        return hashlib.sha256(f"{self.model_id}\0{normalized}".encode('utf-8')).hexdigest()
+
+    def _remember(self, key, entities):
+        self._memory[key] = entities
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return self._memory[key]
+            try:
+                conn = self._disk()
+                row = conn.execute("SELECT value FROM entities WHERE key = ?", (key,)).fetchone() if conn else None
+                if row is not None:
+                    # Lecture seule : la date d'utilisation attend le prochain lot d'écriture
+                    self._touched[key] = time.time()
+                    if len(self._touched) >= NER_CACHE_TOUCH_BATCH:
+                        self._write_touched(conn)
+                        conn.commit()
+            except sqlite3.Error as e:
+                self._disk_error(e)
+                row = None
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            entities = json.loads(row[0])
+            self._remember(key, entities)
+            self.stats['disk_hits'] += 1
+            return entities
+
+    def put(self, key, entities):
+        with self._lock:
+            self._remember(key, entities)
+            try:
+                conn = self._disk()
+                if conn is None:
+                    return
+                value = json.dumps(entities, ensure_ascii=False)
+                previous = conn.execute("SELECT size FROM entities WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entities (key, value, size, used) VALUES (?, ?, ?, ?)",
+                    (key, value, len(value), time.time())
+                )
+                self._touched.pop(key, None)
+                self._write_touched(conn)
+                self._disk_bytes += len(value) - (previous[0] if previous else 0)
+                if self._disk_bytes > self.max_bytes:
+                    self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                self._disk_error(e)
+
+    def _write_touched(self, conn):
+        if self._touched:
+            conn.executemany(
+                "UPDATE entities SET used = ? WHERE key = ?", [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _disk_error(self, error):
+        # Fichier verrouillé trop longtemps, corrompu... : on continue avec le cache mémoire
+        logging.warning(f"NER cache error: {str(error)}")
+        self.stats['errors'] += 1
+        if self._conn is not None:
+            try:
+                self._conn.rollback()
+            except sqlite3.Error:
+                pass
+        self._touched.clear()
+
+    def _evict(self, conn):
+        # Supprime les entrées les moins récemment utilisées, par morceaux bornés, jusqu'à 90 %
+        # de la limite (les copies en mémoire restent valides et partent avec le LRU)
+        target = self.max_bytes * 0.9
+        oldest = "SELECT key FROM entities ORDER BY used LIMIT ?"
+        while self._disk_bytes > target:
+            size, count = conn.execute(
+                f"SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entities WHERE key IN ({oldest})",
+                (NER_CACHE_EVICT_CHUNK,)
+            ).fetchone()
+            if not count:
+                break
+            conn.execute(f"DELETE FROM entities WHERE key IN ({oldest})", (NER_CACHE_EVICT_CHUNK,))
+            self._disk_bytes -= size
+            self.stats['evictions'] += count
+
+    def hit_ratio(self):
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
+
+    def flush(self):
+        # Écrit les dates d'utilisation en attente (avant de lancer des processus, en fin de crawl)
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._write_touched(self._conn)
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    self._disk_error(e)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# ------------------- CACHE HTTP -------------------
+class CachedEntry:
+    __slots__ = ('url', 'status', 'headers', 'body', 'stored')
+
+    def __init__(self, url, status, headers, body, stored):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored = stored
+
+    def response(self):
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = self.status
+        response.headers = requests.structures.CaseInsensitiveDict(self.headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = self.body
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    # Réponses compressées (zlib) dans SQLite, revalidées par ETag / Last-Modified.
+    # En mode offline, seules les réponses en cache sont servies, sans accès réseau.
+    def __init__(self, path=HTTP_CACHE_PATH, ttls=None, default_ttl=HTTP_CACHE_DEFAULT_TTL, offline=False):
+        self.path = path
+        self.ttls = {**HTTP_CACHE_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.offline = offline
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0}
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT NOT NULL, "
+                "status INTEGER NOT NULL, headers TEXT NOT NULL, body BLOB NOT NULL, stored REAL NOT NULL)"
+            )
+        return self._conn
+
+    @staticmethod
+    def _normalize(values):
+        if not values:
+            return []
+        items = values.items() if isinstance(values, dict) else values
+        return sorted(
+            (str(k), str(v)) for k, v in items
+            if k not in HTTP_CACHE_IGNORED_PARAMS and v is not None
+        )
+
+    def key(self, method, url, params=None, data=None):
+        url = url.split('#', 1)[0]
+        raw = json.dumps([method.upper(), url, self._normalize(params), self._normalize(data)])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def ttl(self, url):
+        parts = urlsplit(url)
+        target = f"{parts.netloc.lower()}{parts.path}"
+        matches = [prefix for prefix in self.ttls if target.startswith(prefix)]
+        return self.ttls[max(matches, key=len)] if matches else self.default_ttl
+
+    def get(self, key):
+        with self._lock:
+            row = self._db().execute(
+                "SELECT url, status, headers, body, stored FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        url, status, headers, body, stored = row
+        return CachedEntry(url, status, json.loads(headers), zlib.decompress(body), stored)
+
+    def is_fresh(self, entry):
+        return time.time() - entry.stored < self.ttl(entry.url)
+
+    @staticmethod
+    def validators(entry):
+        headers = {}
+        if entry is not None:
+            if entry.headers.get('ETag'):
+                headers['If-None-Match'] = entry.headers['ETag']
+            if entry.headers.get('Last-Modified'):
+                headers['If-Modified-Since'] = entry.headers['Last-Modified']
+        return headers
+
+    def put(self, key, response):
+        headers = {k: v for k, v in response.headers.items() if k in ('Content-Type', 'ETag', 'Last-Modified')}
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO responses (key, url, status, headers, body, stored) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, response.url, response.status_code, json.dumps(headers),
+                 zlib.compress(response.content), time.time())
+            )
+            self._conn.commit()
+            self.stats['stored'] += 1
+
+    def touch(self, key):
+        with self._lock:
+            self._db().execute("UPDATE responses SET stored = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.stats['revalidated'] += 1
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# ------------------- DÉDUPLICATION -------------------
+class BloomFilter:
+    def __init__(self, capacity, error_rate=DEDUP_BLOOM_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class DedupIndex:
+    # Clés existantes chargées une seule fois (projection), puis vérifiées en mémoire
+    def __init__(self, collection, field='dedup_keys', use_bloom=None, capacity=None,
+                 error_rate=DEDUP_BLOOM_ERROR_RATE, bloom_threshold=DEDUP_BLOOM_THRESHOLD):
+        self.collection = collection
+        self.field = field
+        self.use_bloom = use_bloom
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom_threshold = bloom_threshold
+        self.keys = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self.collection is None:
+            # Sans MongoDB : dédoublonnage limité au crawl en cours
+            self.keys = set()
+            return self
+        count = self.collection.estimated_document_count()
+        use_bloom = self.use_bloom if self.use_bloom is not None else count >= self.bloom_threshold
+        # Marge pour les clés ajoutées pendant le crawl
+        keys = BloomFilter(self.capacity or count * 2, self.error_rate) if use_bloom else set()
+        cursor = self.collection.find({self.field: {'$exists': True}}, {self.field: 1, '_id': 0}).batch_size(10000)
+        for document in cursor:
+            values = document[self.field]
+            for value in values if isinstance(values, list) else [values]:
+                keys.add(value)
+        self.keys = keys
+        logging.info(f"Dedup index loaded {count} keys ({'bloom filter' if use_bloom else 'hash set'})")
+        return self
+
+    def _ensure_loaded(self):
+        if self.keys is None:
+            with self._lock:
+                if self.keys is None:
+                    self.load()
+
+    def __contains__(self, key):
+        self._ensure_loaded()
+        return key in self.keys
+
+    def add(self, key):
+        self._ensure_loaded()
+        with self._lock:
+            self.keys.add(key)
+
+
+# ------------------- LIAISON DES ENREGISTREMENTS -------------------
+_NON_ALNUM = re.compile(r'[\W_]+')
+_DOI = re.compile(r'10\.\d{4,9}/[^\s"<>]+')
+_PUBMED_LINK = re.compile(r'pubmed\.ncbi\.nlm\.nih\.gov/(\d+)')
+_ARXIV_LINK = re.compile(r'arxiv\.org/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?/?$', re.IGNORECASE)
+
+# Permutations MinHash approchées par XOR avec des masques aléatoires sur un hash 64 bits
+_minhash_rng = random.Random(MINHASH_SEED)
+_MINHASH_MASKS = [_minhash_rng.getrandbits(64) for _ in range(MINHASH_PERMUTATIONS)]
+
+def normalize_title(title):
+    # Sans accents, en minuscules, ponctuation et espaces réduits
+    text = unicodedata.normalize('NFKD', title or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(_NON_ALNUM.sub(' ', text).split())
+
+def dedup_key(publication):
+    # Un même titre est dédoublonné par source : entre sources, les enregistrements sont liés
+    return f"{publication['source']}|{normalize_title(publication['title'])}"
+
+# Champs source couverts par l'empreinte de contenu (hors champs dérivés : entités, clés de liaison)
+FINGERPRINT_FIELDS = ('title', 'authors', 'year', 'journal', 'abstract', 'keywords', 'link', 'doi', 'pmid')
+
+def _fingerprint_value(value):
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint_value(item) for item in value]
+    return ' '.join(unicodedata.normalize('NFC', str(value)).split()) if value is not None else ''
+
+def content_fingerprint(publication):
+    # Identique d'un crawl à l'autre tant que le contenu publié par la source ne change pas
+    content = {field: _fingerprint_value(publication.get(field)) for field in FINGERPRINT_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+def normalize_doi(value):
+    match = _DOI.search(value or '')
+    return match.group(0).rstrip('.,;').lower() if match else None
+
+def canonical_ids(publication):
+    # Clés canoniques doi:…, pmid:…, arxiv:… tirées des champs dédiés et du lien
+    link = publication.get('link') or ''
+    ids = set()
+    for value in (publication.get('doi'), link):
+        doi = normalize_doi(value)
+        if doi:
+            ids.add(f"doi:{doi}")
+    pmid = str(publication.get('pmid') or '').strip()
+    match = _PUBMED_LINK.search(link)
+    if pmid.isdigit() or match:
+        ids.add(f"pmid:{int(pmid if pmid.isdigit() else match.group(1))}")
+    match = _ARXIV_LINK.search(link)
+    if match:
+        ids.add(f"arxiv:{match.group(1).lower()}")
+    return sorted(ids)
+
+def title_shingles(title_key, size=TITLE_SHINGLE_SIZE):
+    if len(title_key) <= size:
+        return {title_key}
+    return {title_key[i:i + size] for i in range(len(title_key) - size + 1)}
+
+def minhash_signature(shingles):
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+              for s in shingles]
+    return [min(map(mask.__xor__, hashes)) for mask in _MINHASH_MASKS]
+
+def lsh_bands(signature, bands=LSH_BANDS):
+    rows = len(signature) // bands
+    return [
+        f"{band}:{hashlib.blake2b(repr(signature[band * rows:(band + 1) * rows]).encode(), digest_size=8).hexdigest()}"
+        for band in range(bands)
+    ]
+
+def signature_similarity(a, b):
+    # Estimation de la similarité de Jaccard entre les deux ensembles de 4-grammes
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class RecordLinker:
+    # Rattache chaque enregistrement à un document existant : identifiants canoniques d'abord,
+    # puis titre normalisé, puis titres quasi identiques (bandes LSH en base, signature vérifiée).
+    # Une seule requête par lot ; le document fusionné garde la provenance de chaque source.
+    # Seuls les champs modifiés sont écrits : la source d'origine du document met à jour ses
+    # champs, les autres complètent les champs vides ; rien n'est écrit si rien n'a changé.
+    MERGED_FIELDS = ('authors', 'year', 'journal', 'abstract', 'keywords', 'entities')
+    OWNED_FIELDS = MERGED_FIELDS + ('link', 'doi', 'pmid', 'fingerprint')
+    PROVENANCE_FIELDS = ('link', 'title', 'year', 'journal', 'fingerprint')
+
+    def __init__(self, collection, threshold=TITLE_SIMILARITY_THRESHOLD,
+                 min_title_length=LINK_MIN_TITLE_LENGTH):
+        self.collection = collection
+        self.threshold = threshold
+        self.min_title_length = min_title_length
+        self.stats = {'new': 0, 'by_id': 0, 'by_title': 0, 'by_similarity': 0, 'unchanged': 0}
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def ensure_ready(self):
+        with self._lock:
+            if not self._ready:
+                ensure_unique_index(self.collection, 'title_key')
+                self.collection.create_index('ids')
+                self.collection.create_index('lsh')
+                self.collection.create_index('dedup_keys')
+                self.backfill()
+                self._ready = True
+
+    def backfill(self):
+        # Documents enregistrés avant la liaison : clés calculées une seule fois
+        projection = {'title': 1, 'link': 1, 'doi': 1, 'pmid': 1, 'source': 1, 'year': 1, 'journal': 1}
+        cursor = self.collection.find({'title_key': {'$exists': False}}, projection).batch_size(10000)
+        count = 0
+        for documents in chunked(cursor, MONGO_BATCH_SIZE):
+            operations = [UpdateOne({'_id': d['_id']}, {'$set': self._legacy_fields(d)}) for d in documents]
+            try:
+                self.collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                logging.warning(f"Record linkage backfill: {len(e.details.get('writeErrors', []))} documents skipped")
+            count += len(documents)
+        if count:
+            logging.info(f"Record linkage backfill: {count} existing documents keyed")
+
+    def _legacy_fields(self, document):
+        fields = self.annotate(document)[0]
+        if document.get('source'):
+            fields[f"provenance.{document['source']}"] = {f: document.get(f) for f in self.PROVENANCE_FIELDS}
+        return fields
+
+    def annotate(self, publication):
+        title_key = normalize_title(publication.get('title'))
+        signature = minhash_signature(title_shingles(title_key))
+        fields = {
+            'title_key': title_key,
+            'ids': canonical_ids(publication),
+            'lsh': lsh_bands(signature),
+            'dedup_keys': [dedup_key(publication)] if publication.get('source') else [],
+        }
+        return fields, signature
+
+    def provenance(self, publication):
+        return {field: publication.get(field) for field in self.PROVENANCE_FIELDS}
+
+    def unchanged(self, publications):
+        # Clés des enregistrements déjà stockés à l'identique : empreinte comparée à celle
+        # enregistrée pour leur source, une seule requête par lot
+        self.ensure_ready()
+        by_key = {}
+        for publication in publications:
+            publication.setdefault('fingerprint', content_fingerprint(publication))
+            by_key[dedup_key(publication)] = publication
+        if not by_key:
+            return set()
+        sources = sorted({publication['source'] for publication in by_key.values()})
+        projection = {'dedup_keys': 1, **{f"provenance.{source}.fingerprint": 1 for source in sources}}
+        unchanged = set()
+        for document in self.collection.find({'dedup_keys': {'$in': sorted(by_key)}}, projection):
+            provenance = document.get('provenance') or {}
+            for key in document.get('dedup_keys') or ():
+                publication = by_key.get(key)
+                if publication is None:
+                    continue
+                stored = (provenance.get(publication['source']) or {}).get('fingerprint')
+                if stored == publication['fingerprint']:
+                    unchanged.add(key)
+        return unchanged
+
+    def _similar_title(self, title_key):
+        return len(title_key) >= self.min_title_length
+
+    def _index(self, target, indexes):
+        by_id, by_title, by_band = indexes
+        for key in target['ids']:
+            by_id.setdefault(key, target)
+        by_title.setdefault(target['title_key'], target)
+        if self._similar_title(target['title_key']):
+            for band in target['lsh']:
+                by_band.setdefault(band, []).append(target)
+
+    def _candidates(self, annotated):
+        ids = sorted({key for _, fields, _ in annotated for key in fields['ids']})
+        title_keys = sorted({fields['title_key'] for _, fields, _ in annotated})
+        bands = sorted({band for _, fields, _ in annotated for band in fields['lsh']
+                        if self._similar_title(fields['title_key'])})
+        query = [{'ids': {'$in': ids}}, {'title_key': {'$in': title_keys}}]
+        if bands:
+            query.append({'lsh': {'$in': bands}})
+        projection = {'title_key': 1, 'ids': 1, 'lsh': 1, 'dedup_keys': 1, 'source': 1, 'provenance': 1,
+                      **{field: 1 for field in self.OWNED_FIELDS}}
+        indexes = ({}, {}, {})
+        for document in self.collection.find({'$or': query}, projection):
+            title_key = document.get('title_key') or ''
+            self._index({
+                'filter': {'_id': document['_id']},
+                'title_key': title_key,
+                'ids': document.get('ids') or [],
+                'lsh': document.get('lsh') or [],
+                'signature': minhash_signature(title_shingles(title_key)),
+                'document': document,
+            }, indexes)
+        return indexes
+
+    def _match(self, fields, signature, year, indexes):
+        by_id, by_title, by_band = indexes
+        for key in fields['ids']:
+            if key in by_id:
+                return by_id[key], 'by_id'
+        if fields['title_key'] in by_title:
+            return by_title[fields['title_key']], 'by_title'
+        if self._similar_title(fields['title_key']):
+            for band in fields['lsh']:
+                for target in by_band.get(band, ()):
+                    other_year = _year(target['document'].get('year'))
+                    if year and other_year and abs(year - other_year) > 1:
+                        continue
+                    if signature_similarity(signature, target['signature']) >= self.threshold:
+                        return target, 'by_similarity'
+        return None, 'new'
+
+    def operations(self, publications):
+        # Opérations UpdateOne fusionnant chaque enregistrement dans son document
+        self.ensure_ready()
+        annotated = [(publication, *self.annotate(publication)) for publication in publications]
+        indexes = self._candidates(annotated)
+        operations = []
+        for publication, fields, signature in annotated:
+            publication.setdefault('fingerprint', content_fingerprint(publication))
+            target, how = self._match(fields, signature, _year(publication.get('year')), indexes)
+            source = publication['source']
+            provenance = self.provenance(publication)
+            if target is None:
+                self.stats[how] += 1
+                update = {
+                    '$set': {f"provenance.{source}": provenance},
+                    '$addToSet': {field: {'$each': fields[field]} for field in ('ids', 'lsh', 'dedup_keys')},
+                    '$setOnInsert': {k: v for k, v in to_bson(publication).items() if k not in fields},
+                }
+                target = {'filter': {'title_key': fields['title_key']}, 'signature': signature,
+                          'document': {**to_bson(publication), **fields, 'provenance': {source: provenance}},
+                          **fields}
+                self._index(target, indexes)
+                operations.append(UpdateOne(target['filter'], update, upsert=True))
+                continue
+            update = self._changes(target['document'], publication, fields, provenance)
+            if not update:
+                self.stats['unchanged'] += 1
+                continue
+            self.stats[how] += 1
+            target['ids'] = sorted(set(target['ids']) | set(fields['ids']))
+            self._index(target, indexes)
+            operations.append(UpdateOne(target['filter'], update))
+        return operations
+
+    def _changes(self, document, publication, fields, provenance):
+        # Mise à jour minimale d'un document existant (appliquée aussi à la copie en mémoire)
+        source = publication['source']
+        changes = {}
+        stored = document.setdefault('provenance', {}).get(source)
+        if stored is None:
+            changes[f"provenance.{source}"] = document['provenance'][source] = provenance
+        else:
+            for field, value in provenance.items():
+                if stored.get(field) != value:
+                    changes[f"provenance.{source}.{field}"] = stored[field] = value
+        if document.get('source') == source:
+            # Source d'origine du document : ses champs suivent la source
+            for field in self.OWNED_FIELDS:
+                if field in publication and document.get(field) != publication[field]:
+                    changes[field] = document[field] = publication[field]
+        else:
+            # Champs vides dans le document existant complétés par la nouvelle source
+            for field in self.MERGED_FIELDS:
+                if not document.get(field) and publication.get(field):
+                    changes[field] = document[field] = publication[field]
+        additions = {}
+        for field in ('ids', 'lsh', 'dedup_keys'):
+            known = document.setdefault(field, [])
+            new = [value for value in fields[field] if value not in known]
+            if new:
+                known.extend(new)
+                additions[field] = {'$each': new}
+        update = {}
+        if changes:
+            update['$set'] = changes
+        if additions:
+            update['$addToSet'] = additions
+        return update
+
+
+# ------------------- ÉCRITURES MONGODB -------------------
+class BulkWriter:
+    # Upserts groupés en bulk_write non ordonné, par lots de batch_size. write_operations() et flush()
+    # renvoient le nombre d'opérations refusées ; une panne MongoDB est propagée à l'appelant
+    # (qui ne doit alors ni marquer les publications comme enregistrées ni avancer ses points de reprise).
+    def __init__(self, collection, key='title_key', batch_size=MONGO_BATCH_SIZE, metrics=None):
+        self.collection = collection
+        self.metrics = metrics
+        self.key = key
+        self.batch_size = batch_size
+        self.stats = {'batches': 0, 'upserted': 0, 'matched': 0, 'modified': 0, 'failed': 0, 'latencies': []}
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._indexes_ready = False
+
+    def ensure_indexes(self):
+        if not self._indexes_ready:
+            ensure_unique_index(self.collection, self.key)
+            self.collection.create_index('source')
+            self._indexes_ready = True
+
+    def write_operations(self, operations):
+        # Écrit les lots complets ; le reste attend le prochain appel ou flush()
+        failed = 0
+        with self._lock:
+            self._buffer.extend(operations)
+            while len(self._buffer) >= self.batch_size:
+                failed += self._flush_batch()
+        return failed
+
+    def flush(self):
+        failed = 0
+        with self._lock:
+            while self._buffer:
+                failed += self._flush_batch()
+        return failed
+
+    def _flush_batch(self):
+        batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+        start = time.perf_counter()
+        try:
+            self.ensure_indexes()
+            result = self.collection.bulk_write(batch, ordered=False).bulk_api_result
+            failed = 0
+        except BulkWriteError as e:
+            result = e.details
+            failed = len(result.get('writeErrors', []))
+            logging.error(f"MongoDB bulk write: {failed} failed operations ({result['writeErrors'][0].get('errmsg')})")
+        except Exception:
+            # MongoDB injoignable : ce lot et les suivants sont abandonnés, l'appelant décide
+            self.stats['failed'] += len(batch) + len(self._buffer)
+            self._buffer = []
+            raise
+        latency = time.perf_counter() - start
+
+        self.stats['batches'] += 1
+        self.stats['upserted'] += result.get('nUpserted', 0)
+        self.stats['matched'] += result.get('nMatched', 0)
+        self.stats['modified'] += result.get('nModified', 0)
+        self.stats['failed'] += failed
+        self.stats['latencies'].append(latency)
+        if self.metrics is not None:
+            self.metrics.observe('mongo_batch_size', len(batch), buckets=METRICS_SIZE_BUCKETS)
+            self.metrics.observe('mongo_write_seconds', latency)
+        logging.info(
+            f"Bulk write of {len(batch)} publications in {latency * 1000:.0f} ms "
+            f"(upserted {result.get('nUpserted', 0)}, matched {result.get('nMatched', 0)}, failed {failed})"
+        )
+        return failed
+
+
+# ------------------- SORTIES -------------------
+class Sink(abc.ABC):
+    # Destination des lots enregistrés par AcademicScraper._save_results. write() ne rend la main
+    # qu'une fois le lot durable (sur disque ou confirmé par MongoDB) : les points de reprise et
+    # l'index de déduplication avancent aussitôt après. close() en fin de crawl range les sorties.
+    name = 'sink'
+
+    @abc.abstractmethod
+    def write(self, publications):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class MongoSink(Sink):
+    # Liaison puis upserts groupés (voir RecordLinker et BulkWriter)
+    name = 'mongodb'
+
+    def __init__(self, linker, writer):
+        self.linker = linker
+        self.writer = writer
+
+    def write(self, publications):
+        # Écriture confirmée à chaque lot : les points de reprise n'avancent qu'après elle
+        failed = self.writer.write_operations(self.linker.operations(publications)) + self.writer.flush()
+        if failed:
+            raise RuntimeError(f"{failed} of {len(publications)} publications not written")
+
+    def flush(self):
+        self.writer.flush()
+
+
+class JsonlSink(Sink):
+    # Une publication par ligne, ajoutée au fil des lots et synchronisée sur disque avant de rendre
+    # la main ; gzip si le chemin finit par .gz (un membre gzip complet par lot : le fichier reste
+    # lisible en entier même après un arrêt brutal, les lecteurs gzip enchaînent les membres)
+    name = 'jsonl'
+
+    def __init__(self, path):
+        self.path = path
+        self.stats = {'records': 0}
+        self._lock = threading.Lock()
+
+    def write(self, publications):
+        data = ''.join(json.dumps(to_bson(p), ensure_ascii=False, default=str) + '\n' for p in publications)
+        data = data.encode('utf-8')
+        if self.path.endswith('.gz'):
+            data = gzip.compress(data)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self.stats['records'] += len(publications)
+
+
+class ParquetSink(Sink):
+    # Jeu de données Parquet partitionné à la Hive : <dossier>/source=<source>/year=<année>/part-*.parquet
+    # (lisible par pyarrow.dataset, pandas, DuckDB, Spark). Chaque write() écrit un fichier complet
+    # par partition touchée, synchronisé sur disque : un lot confirmé survit à un arrêt brutal.
+    # close() regroupe ensuite les fichiers du crawl en un seul par partition, par groupes de
+    # chunk_rows lignes. Un arrêt pendant ce regroupement laisse des fichiers lisibles, au pire
+    # avec des lignes en double entre le fichier regroupé et ceux pas encore supprimés.
+    name = 'parquet'
+
+    def __init__(self, directory, chunk_rows=EXPORT_CHUNK_ROWS, compression=EXPORT_PARQUET_COMPRESSION):
+        try:
+            import pyarrow  # export Parquet optionnel, importé seulement ici
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("pyarrow is required for ParquetSink (pip install pyarrow)")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+        strings = pyarrow.list_(pyarrow.string())
+        # source et year sont portés par les chemins de partition
+        self.schema = pyarrow.schema([
+            ('title', pyarrow.string()), ('authors', strings), ('journal', pyarrow.string()),
+            ('abstract', pyarrow.string()), ('link', pyarrow.string()), ('doi', pyarrow.string()),
+            ('pmid', pyarrow.string()), ('keywords', strings),
+            ('entities', pyarrow.map_(pyarrow.string(), strings)), ('fingerprint', pyarrow.string()),
+        ])
+        self.run_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{os.urandom(3).hex()}"
+        self.stats = {'records': 0, 'files': 0, 'row_groups': 0}
+        self._parts = {}  # partition -> [(fichier, groupes de lignes)] écrits par ce crawl
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def write(self, publications):
+        partitions = {}
+        for publication in publications:
+            partitions.setdefault((publication.get('source'), publication.get('year')), []).append(publication)
+        tables = {key: self._pa.Table.from_pydict(
+            {name: [row.get(name) for row in rows] for name in self.schema.names}, schema=self.schema
+        ) for key, rows in partitions.items()}
+        with self._lock:
+            for key, table in tables.items():
+                self._parts.setdefault(key, []).append(self._write_file(key, [table]))
+                self.stats['records'] += table.num_rows
+
+    def close(self):
+        with self._lock:
+            for key, parts in self._parts.items():
+                if len(parts) > 1:
+                    self._write_file(key, (self._pq.ParquetFile(path).read() for path, _ in parts))
+                    for path, groups in parts:
+                        os.remove(path)
+                        self.stats['files'] -= 1
+                        self.stats['row_groups'] -= groups
+            self._parts = {}
+
+    def _write_file(self, key, tables):
+        # Écrit sous un nom caché, synchronisé puis renommé : un lecteur ne voit jamais de fichier partiel
+        source, year = key
+        directory = os.path.join(
+            self.directory, f"source={quote(source or '__HIVE_DEFAULT_PARTITION__', safe='')}",
+            f"year={year if year is not None else '__HIVE_DEFAULT_PARTITION__'}",
+        )
+        os.makedirs(directory, exist_ok=True)
+        self._written += 1
+        name = f"part-{self.run_id}-{self._written:05d}.parquet"
+        temporary = os.path.join(directory, f".{name}.tmp")
+        groups = 0
+        with open(temporary, 'wb') as f:
+            writer = self._pq.ParquetWriter(f, self.schema, compression=self.compression)
+            pending, rows = [], 0
+            for table in tables:
+                pending.append(table)
+                rows += table.num_rows
+                while rows >= self.chunk_rows:
+                    merged = self._pa.concat_tables(pending)
+                    writer.write_table(merged.slice(0, self.chunk_rows), row_group_size=self.chunk_rows)
+                    pending, rows = [merged.slice(self.chunk_rows)], rows - self.chunk_rows
+                    groups += 1
+            if rows:
+                writer.write_table(self._pa.concat_tables(pending), row_group_size=self.chunk_rows)
+                groups += 1
+            writer.close()
+            f.flush()
+            os.fsync(f.fileno())
+        path = os.path.join(directory, name)
+        os.replace(temporary, path)
+        self.stats['files'] += 1
+        self.stats['row_groups'] += groups
+        return path, groups
+
+
+def export_sinks(directory):
+    # Sorties fichiers standard sous `directory` ; JSON Lines seul si pyarrow est absent
+    sinks = [JsonlSink(os.path.join(directory, 'publications.jsonl.gz'))]
+    try:
+        sinks.insert(0, ParquetSink(os.path.join(directory, 'parquet')))
+    except RuntimeError as e:
+        logging.warning(f"Parquet export disabled: {str(e)}")
+    return sinks
+
+
+# ------------------- LIMITATION DE DÉBIT -------------------
+class TokenBucket:
+    def __init__(self, rate, per=1.0, capacity=None):
+        self.rate = rate / per  # jetons par seconde
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        # Réserve un jeton et renvoie l'attente nécessaire
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        # Prochain jeton disponible dans exactement `seconds` (Retry-After, throttling), après
+        # remise à niveau : une attente déjà plus longue est gardée, les deux ne s'additionnent pas
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class SharedTokenBucket:
+    # Même contrat que TokenBucket, mais l'état vit dans MongoDB : tous les workers d'un hôte
+    # partagent le même débit. Algorithme GCRA : `tat` est l'instant théorique du prochain
+    # créneau libre (horloge murale, les machines doivent être synchronisées par NTP).
+    def __init__(self, collection, host, rate, per=1.0, capacity=None):
+        self.collection = collection
+        self.host = host
+        self.rate = rate / per
+        self.capacity = capacity or max(1, int(rate))
+        self.interval = 1 / self.rate
+        self.collection.update_one({'_id': host}, {'$setOnInsert': {'tat': 0.0}}, upsert=True)
+
+    def _reserve(self):
+        # Deux mises à jour atomiques : tat >= maintenant, puis un créneau de plus ; les `$inc`
+        # concurrents s'additionnent, aucun créneau n'est attribué deux fois
+        now = time.time()
+        self.collection.update_one({'_id': self.host}, {'$max': {'tat': now}})
+        document = self.collection.find_one_and_update(
+            {'_id': self.host}, {'$inc': {'tat': self.interval}}, return_document=ReturnDocument.AFTER
+        )
+        slot = document['tat'] - self.interval
+        return max(0.0, slot - now - (self.capacity - 1) * self.interval)
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        # Retry-After reçu par un worker : tous les workers attendent (rafale comprise)
+        tat = time.time() + seconds + (self.capacity - 1) * self.interval
+        self.collection.update_one({'_id': self.host}, {'$max': {'tat': tat}})
+
+
+class AdaptiveConcurrency:
+    # Augmentation additive sur succès, division par deux sur throttling
+    def __init__(self, initial=ADAPTIVE_INITIAL_CONCURRENCY, maximum=ADAPTIVE_MAX_CONCURRENCY):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def on_success(self):
+        with self._condition:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def on_throttle(self):
+        with self._condition:
+            self.limit = max(1.0, self.limit / 2)
+
+
+class CircuitBreaker:
+    # closed -> open après `threshold` échecs consécutifs -> half_open après `cooldown` (un seul essai)
+    def __init__(self, threshold=BREAKER_FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = 'half_open'
+                self._trial = False
+            if self.state == 'half_open' and not self._trial:
+                self._trial = True
+                return True
+            return self.state == 'closed'
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open':
+                self.cooldown = min(self.cooldown * 2, BREAKER_MAX_COOLDOWN)
+            if self.state == 'half_open' or self.failures >= self.threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+            return self.state
+
+
+class HostPolicy:
+    def __init__(self, host, bucket):
+        self.host = host
+        self.bucket = bucket
+        self.concurrency = AdaptiveConcurrency()
+        self.breaker = CircuitBreaker()
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'failures': 0, 'short_circuited': 0}
+
+    def on_success(self):
+        self.concurrency.on_success()
+        self.breaker.record_success()
+
+    def on_throttle(self, delay):
+        self.stats['throttled'] += 1
+        self.concurrency.on_throttle()
+        self.bucket.pause(delay)
+        self.on_failure()
+
+    def on_failure(self):
+        self.stats['failures'] += 1
+        if self.breaker.record_failure() == 'open':
+            logging.warning(f"Circuit open for {self.host}, retrying in {self.breaker.cooldown}s")
+
+    def snapshot(self):
+        return {**self.stats, 'concurrency': round(self.concurrency.limit, 2), 'breaker': self.breaker.state}
+
+
+def retry_after_seconds(response):
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+
+class HostRateLimiter:
+    # shared : collection MongoDB des seaux partagés entre workers (seaux locaux sinon)
+    def __init__(self, limits=None, default=DEFAULT_RATE_LIMIT, ncbi_api_key=None, shared=None):
+        self.limits = dict(HOST_RATE_LIMITS)
+        if ncbi_api_key:
+            self.limits['eutils.ncbi.nlm.nih.gov'] = NCBI_API_KEY_RATE_LIMIT
+        self.limits.update(limits or {})
+        self.default = default
+        self.shared = shared
+        self._policies = {}
+        self._lock = threading.Lock()
+
+    def new_bucket(self, host):
+        if self.shared is not None:
+            return SharedTokenBucket(self.shared, host, *self.limits.get(host, self.default))
+        return TokenBucket(*self.limits.get(host, self.default))
+
+    def policy(self, url):
+        host = host_of(url)
+        with self._lock:
+            if host not in self._policies:
+                self._policies[host] = HostPolicy(host, self.new_bucket(host))
+            return self._policies[host]
+
+    def bucket(self, url):
+        return self.policy(url).bucket
+
+    def acquire(self, url):
+        return self.bucket(url).acquire()
+
+    def stats(self):
+        with self._lock:
+            policies = list(self._policies.values())
+        return {policy.host: policy.snapshot() for policy in policies}
+
+
+# ------------------- POINTS DE REPRISE -------------------
+ARXIV_UPDATED = re.compile(r'<entry>.*?<updated>([^<]+)</updated>', re.DOTALL)
+# Filtre OpenAlex utilisé pour les crawls incrémentaux
+OPENALEX_WATERMARK_FILTER = 'from_updated_date'
+
+class CrawlState:
+    # État d'un crawl (source, requête) : position de reprise, watermark, pages confirmées en ordre
+    def __init__(self, store=None, source=None, query=None, document=None):
+        document = document or {}
+        resuming = document.get('status') == 'running'
+        self.store = store
+        self.source = source
+        self.query = query
+        self.position = document.get('position') if resuming else None
+        self.watermark = document.get('watermark')
+        self.run_started = document.get('run_started') if resuming else None
+        self.run_started = self.run_started or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        self.failed = False
+        self.last_seq = None
+        self.next_position = None
+        self._positions = {}
+        self._done = set()
+        self._next_seq = 0
+        self._committed = -1
+        self._settled = 0
+        self._exhausted = False
+        self._lock = threading.Lock()
+        if resuming and self.position is not None:
+            logging.info(f"{source}: resuming '{query}' from {self.position}")
+        self._save(status='running', position=self.position, run_started=self.run_started)
+
+    def page(self, position_after):
+        # Appelé par le fetcher juste avant de produire une page
+        with self._lock:
+            self.last_seq = self._next_seq
+            self.next_position = position_after
+            self._positions[self._next_seq] = position_after
+            self._next_seq += 1
+            return self.last_seq
+
+    def done(self, seq, saved=True):
+        # Appelé une fois la page enregistrée ; la position n'avance que sur des pages contiguës.
+        # saved=False (écriture non confirmée) : la position s'arrête avant cette page et le crawl
+        # reste 'running' pour la reprendre au prochain lancement
+        if seq is None:
+            return
+        with self._lock:
+            self._settled += 1
+            if saved:
+                self._done.add(seq)
+            else:
+                self.failed = True
+            position = None
+            while self._committed + 1 in self._done:
+                self._committed += 1
+                self._done.discard(self._committed)
+                position = self._positions.pop(self._committed)
+            if position is not None:
+                self._save(position=position)
+            self._maybe_finish()
+
+    def exhausted(self):
+        with self._lock:
+            self._exhausted = True
+            self._maybe_finish()
+
+    def _maybe_finish(self):
+        if self._exhausted and self._settled == self._next_seq:
+            if self.failed:
+                logging.warning(f"{self.source}: '{self.query}' incomplete, will resume on next run")
+            else:
+                self._save(status='done', position=None, watermark=self.run_started)
+            self._exhausted = False
+
+    def _save(self, **fields):
+        if self.store is not None:
+            self.store.save(self.source, self.query, **fields)
+
 
-# Configuration MongoDB
-client = MongoClient("mongodb://localhost:27017/")
-db = client["academic_database44"]
-collection = db["publications"]
+class CheckpointStore:
+    def __init__(self, collection):
+        self.collection = collection
+        self._indexed = False
 
-# Configuration spaCy
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    spacy.cli.download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+    def open(self, source, query):
+        if not self._indexed:
+            self.collection.create_index([('source', 1), ('query', 1)], unique=True)
+            self._indexed = True
+        document = self.collection.find_one({'source': source, 'query': query})
+        return CrawlState(self, source, query, document)
 
-# Configuration globale
-REQUEST_DELAY = (1, 3)
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0",
-]
+    def save(self, source, query, **fields):
+        self.collection.update_one(
+            {'source': source, 'query': query},
+            {'$set': {**fields, 'updated': datetime.now(timezone.utc)}},
+            upsert=True
+        )
 
-# ------------------- FONCTIONS UTILITAIRES -------------------
-def get_random_header():
-    return {
-        'User-Agent': random.choice(USER_AGENTS),
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Referer': 'https://www.google.com/',
-        'DNT': str(random.randint(0, 1))
-    }
+    def reset(self, source=None, query=None):
+        selector = {k: v for k, v in (('source', source), ('query', query)) if v is not None}
+        self.collection.delete_many(selector)
+
+
+# ------------------- FILE DE TÂCHES DISTRIBUÉE -------------------
+def new_run_id():
+    return datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S') + '-' + os.urandom(2).hex()
+
+
+class TaskQueue:
+    # Tâches {run, source, query, position, options[, ids]} : une page, un curseur, une tranche
+    # d'IDs NCBI (position {'list': début}) ou un lot d'IDs (position = index du premier ID).
+    # pending -> leased (bail prolongé par heartbeat) -> done | pending (échec, bail expiré) | failed
+    # run identifie une soumission : les tâches suivantes en héritent, et soumettre de nouveau
+    # (crawl du lendemain) crée de nouvelles tâches au lieu de retrouver celles déjà terminées.
+    FIELDS = ('run', 'source', 'query', 'position', 'options', 'ids', 'fetched')
+
+    def __init__(self, collection, lease=TASK_LEASE_SECONDS, max_attempts=TASK_MAX_ATTEMPTS):
+        self.collection = collection
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._indexed = False
+
+    @staticmethod
+    def task_id(task):
+        return json.dumps([task.get('run'), task['source'], task['query'], task.get('position')], default=str)
+
+    def ensure_indexes(self):
+        if not self._indexed:
+            self.collection.create_index([('status', 1), ('created', 1)])
+            self.collection.create_index([('status', 1), ('lease_expires', 1)])
+            self._indexed = True
+
+    def enqueue(self, tasks):
+        # Idempotent : une tâche déjà connue (même run, source, requête et position) n'est pas dupliquée
+        self.ensure_indexes()
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne({'_id': self.task_id(task)}, {'$setOnInsert': {
+                **{field: task[field] for field in self.FIELDS if field in task}, 'status': 'pending', 'attempts': 0, 'worker': None, 'lease_expires': None,
+                'created': now, 'updated': now,
+            }}, upsert=True)
+            for task in tasks
+        ]
+        if not operations:
+            return 0
+        return self.collection.bulk_write(operations, ordered=False).upserted_count
+
+    def claim(self, worker_id):
+        # Réservation atomique de la plus ancienne tâche en attente
+        self.ensure_indexes()
+        now = datetime.now(timezone.utc)
+        return self.collection.find_one_and_update(
+            {'status': 'pending'},
+            {'$set': {'status': 'leased', 'worker': worker_id, 'updated': now,
+                      'lease_expires': now + timedelta(seconds=self.lease)},
+             '$inc': {'attempts': 1}},
+            sort=[('created', 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def heartbeat(self, task, worker_id):
+        # False : le bail a expiré et la tâche a été reprise par un autre worker
+        now = datetime.now(timezone.utc)
+        result = self.collection.update_one(
+            {'_id': task['_id'], 'status': 'leased', 'worker': worker_id},
+            {'$set': {'lease_expires': now + timedelta(seconds=self.lease), 'updated': now}},
+        )
+        return result.matched_count == 1
+
+    def complete(self, task, worker_id, records=0, follow_ups=()):
+        # Les tâches suivantes sont mises en file avant la confirmation : rien n'est perdu si le
+        # worker s'arrête entre les deux (la tâche sera rejouée, l'ajout est idempotent)
+        self.enqueue(follow_ups)
+        result = self.collection.update_one(
+            {'_id': task['_id'], 'status': 'leased', 'worker': worker_id},
+            {'$set': {'status': 'done', 'records': records, 'lease_expires': None,
+                      'updated': datetime.now(timezone.utc)}},
+        )
+        return result.matched_count == 1
+
+    def fail(self, task, worker_id, error):
+        status = 'failed' if task.get('attempts', 0) >= self.max_attempts else 'pending'
+        self.collection.update_one(
+            {'_id': task['_id'], 'status': 'leased', 'worker': worker_id},
+            {'$set': {'status': status, 'error': error, 'worker': None, 'lease_expires': None,
+                      'updated': datetime.now(timezone.utc)}},
+        )
+        return status
+
+    def requeue_expired(self):
+        # Bails expirés (worker arrêté ou bloqué) : remis en file, ou abandonnés après max_attempts
+        now = datetime.now(timezone.utc)
+        expired = {'status': 'leased', 'lease_expires': {'$lt': now}}
+        reset = {'worker': None, 'lease_expires': None, 'updated': now}
+        self.collection.update_many(
+            {**expired, 'attempts': {'$gte': self.max_attempts}},
+            {'$set': {'status': 'failed', 'error': 'lease expired', **reset}},
+        )
+        return self.collection.update_many(expired, {'$set': {'status': 'pending', **reset}}).modified_count
+
+    def counts(self):
+        counts = dict.fromkeys(('pending', 'leased', 'done', 'failed'), 0)
+        for row in self.collection.aggregate([{'$group': {'_id': '$status', 'count': {'$sum': 1}}}]):
+            counts[row['_id']] = row['count']
+        return counts
+
+    def reset(self, source=None, query=None):
+        selector = {k: v for k, v in (('source', source), ('query', query)) if v is not None}
+        self.collection.delete_many(selector)
+
+
+class CrawlWorker:
+    # Boucle d'un worker : réserve une tâche, prolonge son bail pendant l'exécution, la confirme.
+    # Plusieurs workers (threads, processus ou machines) peuvent partager la même file.
+    def __init__(self, scraper, tasks, worker_id=None, heartbeat=TASK_HEARTBEAT_SECONDS,
+                 poll_interval=TASK_POLL_INTERVAL):
+        self.scraper = scraper
+        self.tasks = tasks
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{os.urandom(3).hex()}"
+        self.heartbeat = heartbeat
+        self.poll_interval = poll_interval
+        self.stats = {'tasks': 0, 'records': 0, 'failed': 0, 'lost': 0}
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, max_tasks=None, drain=False):
+        # drain=True : s'arrête quand plus aucune tâche n'est en attente ni en cours ailleurs
+        logging.info(f"Worker {self.worker_id} started")
+        last_requeue = 0.0
+        while not self._stop.is_set() and (max_tasks is None or self.stats['tasks'] < max_tasks):
+            if time.monotonic() - last_requeue >= self.heartbeat:
+                requeued = self.tasks.requeue_expired()
+                if requeued:
+                    logging.warning(f"Requeued {requeued} tasks with expired leases")
+                last_requeue = time.monotonic()
+            task = self.tasks.claim(self.worker_id)
+            if task is None:
+                if drain and not self.tasks.collection.count_documents({'status': {'$in': ['pending', 'leased']}}):
+                    break
+                self._stop.wait(self.poll_interval)
+                continue
+            self.execute(task)
+        logging.info(f"Worker {self.worker_id} stopped: {self.stats}")
+        return self.stats
+
+    def execute(self, task):
+        metrics = self.scraper.metrics
+        lost = threading.Event()
+        done = threading.Event()
+
+        def beat():
+            while not done.wait(self.heartbeat):
+                if not self.tasks.heartbeat(task, self.worker_id):
+                    lost.set()
+                    return
+
+        heart = threading.Thread(target=beat, name=f"heartbeat-{self.worker_id}", daemon=True)
+        heart.start()
+        start = time.perf_counter()
+        try:
+            records, follow_ups = self.scraper.run_task(task)
+        except Exception as e:
+            status = self.tasks.fail(task, self.worker_id, str(e))
+            self.stats['failed'] += 1
+            metrics.inc('tasks_total', source=task['source'], status='error')
+            logging.error(f"Task {task['_id']} failed (attempt {task.get('attempts')}, now {status}): {str(e)}")
+            return
+        finally:
+            done.set()
+            heart.join()
+            metrics.observe('task_seconds', time.perf_counter() - start, source=task['source'])
+            self.stats['tasks'] += 1
+        # Bail perdu : un autre worker a repris la tâche ; les écritures sont idempotentes
+        if lost.is_set() or not self.tasks.complete(task, self.worker_id, records, follow_ups):
+            self.stats['lost'] += 1
+            metrics.inc('tasks_total', source=task['source'], status='lost')
+            logging.warning(f"Lease lost for task {task['_id']}")
+            return
+        self.stats['records'] += records
+        metrics.inc('tasks_total', source=task['source'], status='done')
+
+
+# ------------------- PIPELINE -------------------
+_STOP = object()
+
+class PipelineStage:
+    def __init__(self, name, fn, workers=1, queue_size=PIPELINE_QUEUE_SIZE):
+        # fn(item) renvoie un itérable de sorties pour l'étape suivante (ou None)
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.processed = 0
+        self.errors = 0
+        # Temps passé dans fn par sortie produite (par élément pour la dernière étape),
+        # hors attente sur la file suivante
+        self.latencies = deque(maxlen=PIPELINE_LATENCY_SAMPLES)
+        self._running = workers
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self):
+        return self.queue.qsize()
+
+
+class Pipeline:
+    # Chaque étape a son pool de threads ; les files bornées propagent la contre-pression
+    def __init__(self, stages, metrics=None):
+        self.stages = stages
+        self.metrics = metrics
+
+    def _record(self, stage, duration):
+        stage.latencies.append(duration)
+        if self.metrics is not None:
+            self.metrics.observe('stage_seconds', duration, stage=stage.name)
+
+    def _put(self, stage, item):
+        # Jauge pipeline_queue_depth : éléments en attente de l'étape, producteurs bloqués par la
+        # contre-pression compris ; les pipelines simultanés (run_jobs) s'additionnent
+        if self.metrics is not None:
+            self.metrics.add_gauge('pipeline_queue_depth', 1, stage=stage.name)
+        stage.queue.put(item)
+
+    def _get(self, stage):
+        item = stage.queue.get()
+        if item is not _STOP and self.metrics is not None:
+            self.metrics.add_gauge('pipeline_queue_depth', -1, stage=stage.name)
+        return item
+
+    def _work(self, index):
+        stage = self.stages[index]
+        downstream = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = self._get(stage)
+            if item is _STOP:
+                break
+            try:
+                mark = time.perf_counter()
+                produced = False
+                for output in stage.fn(item) or ():
+                    self._record(stage, time.perf_counter() - mark)
+                    produced = True
+                    if downstream is not None:
+                        self._put(downstream, output)
+                    mark = time.perf_counter()
+                if not produced:
+                    self._record(stage, time.perf_counter() - mark)
+                with stage._lock:
+                    stage.processed += 1
+            except Exception as e:
+                with stage._lock:
+                    stage.errors += 1
+                logging.error(f"Pipeline stage {stage.name} error: {str(e)}")
+
+        with stage._lock:
+            stage._running -= 1
+            last = stage._running == 0
+        if last and downstream is not None:
+            for _ in range(downstream.workers):
+                downstream.queue.put(_STOP)
+
+    def run(self, items):
+        threads = [
+            threading.Thread(target=self._work, args=(index,), name=f"{stage.name}-{n}", daemon=True)
+            for index, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        first = self.stages[0]
+        for item in items:
+            self._put(first, item)
+        for _ in range(first.workers):
+            first.queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+        return self.stats()
+
+    def depths(self):
+        return {stage.name: stage.depth for stage in self.stages}
+
+    def stats(self):
+        stats = {}
+        for stage in self.stages:
+            latencies = list(stage.latencies)
+            stats[stage.name] = {
+                'workers': stage.workers, 'depth': stage.depth,
+                'processed': stage.processed, 'errors': stage.errors,
+                'p50': percentile(latencies, 50), 'p99': percentile(latencies, 99),
+            }
+        return stats
+
+
+# ------------------- PROCESSUS DE PARSING / NER -------------------
+_worker_entity_cache = None
+
+def _init_process_worker(cache_path=None, model=NER_MODEL):
+    # Exécuté une fois par processus : le modèle spaCy n'est chargé (par get_nlp) qu'au premier
+    # résumé à annoter, chaque worker garde son propre cache NER (le fichier SQLite est partagé,
+    # chaque processus a sa connexion) ; fermé à la sortie du worker pour écrire ses derniers accès
+    global _worker_entity_cache
+    _worker_entity_cache = EntityCache(path=cache_path, model=model)
+    multiprocessing.util.Finalize(_worker_entity_cache, _worker_entity_cache.close, exitpriority=10)
 
-def ethical_delay():
-    time.sleep(random.uniform(*REQUEST_DELAY))
+def process_page(name, page, batch_size=NER_BATCH_SIZE, annotate=True):
+    # Parsing (+ NER) d'une page brute ; renvoie un lot d'enregistrements picklable
+    records = list(SOURCES[name](page))
+    if annotate:
+        annotate_records(records, batch_size)
+    return name, records
 
-def extract_entities(text):
-    if not text:
-        return {}
-    doc = nlp(text)
-    return {ent.label_: list(set(ent.text for ent in doc.ents)) for ent in doc.ents}
+def annotate_records(records, batch_size=NER_BATCH_SIZE):
+    # NER seul, pour les enregistrements restants après la détection des changements
+    annotate_entities(records, batch_size, 1, _worker_entity_cache, _worker_entity_cache.model)
+    return records
+
+
+# ------------------- RESSOURCES PARTAGÉES -------------------
+class ScraperConfig:
+    # Où trouver MongoDB, le modèle spaCy et le journal ; le client MongoDB n'est ouvert
+    # qu'au premier accès à une collection
+    def __init__(self, mongo_uri=MONGO_URI, database=MONGO_DATABASE, collection=MONGO_COLLECTION,
+                 checkpoints_collection=CHECKPOINTS_COLLECTION, tasks_collection=TASKS_COLLECTION,
+                 rate_limits_collection=RATE_LIMITS_COLLECTION, ner_model=NER_MODEL,
+                 log_file=LOG_FILE, log_level=logging.INFO):
+        self.mongo_uri = mongo_uri
+        self.database = database
+        self.collection_name = collection
+        self.checkpoints_collection_name = checkpoints_collection
+        self.tasks_collection_name = tasks_collection
+        self.rate_limits_collection_name = rate_limits_collection
+        self.ner_model = ner_model
+        self.log_file = log_file
+        self.log_level = log_level
+        self._client = None
+        self._lock = threading.Lock()
+
+    def mongo_client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = MongoClient(self.mongo_uri)
+            return self._client
+
+    def collection(self, name=None):
+        return self.mongo_client()[self.database][name or self.collection_name]
+
+    def checkpoints_collection(self):
+        return self.collection(self.checkpoints_collection_name)
+
+    def tasks_collection(self):
+        return self.collection(self.tasks_collection_name)
+
+    def rate_limits_collection(self):
+        return self.collection(self.rate_limits_collection_name)
+
+    def configure_logging(self):
+        configure_logging(self.log_file, self.log_level)
+
+    def nlp(self):
+        return get_nlp(self.ner_model)
+
+
+def load_jobs(path):
+    # Fichier de travaux : JSON (liste, ou {"email": ..., "jobs": [...]}) ou JSON Lines,
+    # chaque travail étant {"query": ..., "sources": [...], "max_results": {...} | n, "email": ...}
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        content = json.load(f)
+    if isinstance(content, dict):
+        return [{'email': content.get('email'), **job} for job in content.get('jobs', [])]
+    return content
 
-def is_duplicate(title):
-    return collection.count_documents({'title': title}) > 0
 
 # ------------------- SCRAPERS -------------------
 class AcademicScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(get_random_header())
+    def __init__(self, ncbi_api_key=NCBI_API_KEY, rate_limits=None,
+                 ner_batch_size=NER_BATCH_SIZE, ner_processes=1, entity_cache=None, dedup_index=None,
+                 mongo_batch_size=MONGO_BATCH_SIZE, mongo_flush_interval=MONGO_FLUSH_INTERVAL,
+                 ncbi_batch_size=NCBI_EFETCH_BATCH_SIZE, ncbi_concurrency=NCBI_CONCURRENCY,
+                 response_cache=None, checkpoints=None, linker=None, mongo_collection=None, metrics=None,
+                 config=None, shared_rate_limits=None, sinks=(), mongo=True):
+        # Un pool de sessions partagé par toutes les sources et requêtes (connexions réutilisées),
+        # un seau à jetons par hôte partagé entre toutes les sources ; shared_rate_limits
+        # (collection MongoDB) : seaux communs à tous les workers ; sinks : sorties en plus de MongoDB
+        # (voir export_sinks) ; mongo=False : crawl sans MongoDB
+        self.config = config or ScraperConfig()
+        self.config.configure_logging()
+        self._sessions = queue.LifoQueue()
+        self._resources_lock = threading.RLock()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.ncbi_api_key = ncbi_api_key
+        self.rate_limiter = HostRateLimiter(rate_limits, ncbi_api_key=ncbi_api_key, shared=shared_rate_limits)
+        self.ncbi_batch_size = ncbi_batch_size
+        self.ncbi_concurrency = ncbi_concurrency
+        self.ner_batch_size = ner_batch_size
+        self.ner_processes = ner_processes
+        self.entity_cache = entity_cache if entity_cache is not None else EntityCache(model=self.config.ner_model)
+        self.mongo_batch_size = mongo_batch_size
+        self.mongo_flush_interval = mongo_flush_interval
+        # Ressources MongoDB créées à la première utilisation (voir _resource)
+        self._collection = mongo_collection
+        self._dedup_index = dedup_index
+        self._linker = linker
+        self._writer = None
+        self._checkpoints = checkpoints
+        self._export_sinks = list(sinks)
+        self.uses_mongo = mongo
+        self._sinks = None
+        self._save_lock = threading.Lock()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        # Mode lot : couples (base, PMID) déjà récupérés par une autre requête du lot (None hors lot),
+        # et ceux en cours de téléchargement (rendus aux autres requêtes si le téléchargement échoue).
+        # pubmed et medline partagent les PMIDs mais pas les documents : la base fait partie de la clé.
+        self.ncbi_seen = None
+        self._ncbi_pending = set()
+        self._ncbi_seen_lock = threading.Lock()
+        self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        self.metrics.add_collector(self._collect_metrics)
+
+    def _resource(self, name, factory):
+        value = getattr(self, name)
+        if value is None:
+            with self._resources_lock:
+                value = getattr(self, name)
+                if value is None:
+                    value = factory()
+                    setattr(self, name, value)
+        return value
+
+    @property
+    def collection(self):
+        return self._resource('_collection', self.config.collection)
+
+    @property
+    def dedup_index(self):
+        return self._resource('_dedup_index', lambda: DedupIndex(self.collection if self.uses_mongo else None))
+
+    @property
+    def linker(self):
+        return self._resource('_linker', lambda: RecordLinker(self.collection))
+
+    @property
+    def writer(self):
+        return self._resource('_writer', lambda: BulkWriter(
+            self.collection, batch_size=self.mongo_batch_size, metrics=self.metrics,
+        ))
 
-    def safe_request(self, url, params=None, retries=3, backoff_factor=0.5):
-        for attempt in range(retries):
+    @property
+    def checkpoints(self):
+        # False : pas de points de reprise (défaut sans MongoDB)
+        return self._resource('_checkpoints', lambda: (
+            CheckpointStore(self.config.checkpoints_collection()) if self.uses_mongo else False
+        ))
+
+    @property
+    def sinks(self):
+        # Fichiers d'abord, MongoDB en dernier : une empreinte enregistrée dans MongoDB (qui fait
+        # ignorer l'enregistrement inchangé au crawl suivant) implique un export déjà confirmé
+        return self._resource('_sinks', lambda: self._export_sinks + (
+            [MongoSink(self.linker, self.writer)] if self.uses_mongo else []
+        ))
+
+    def close(self):
+        # Fin de crawl : les sorties fichiers écrivent leurs derniers morceaux
+        self.entity_cache.flush()
+        for sink in self.sinks:
             try:
-                ethical_delay()
-                response = self.session.get(url, params=params, timeout=30)  # Increased timeout
-                response.raise_for_status()
-                return response
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:  # Too Many Requests
-                    logging.warning(f"429 Too Many Requests, retrying in {backoff_factor * (2 ** attempt)} seconds")
-                    time.sleep(backoff_factor * (2 ** attempt))  # Exponential backoff
-                elif e.response.status_code == 403:
-                    logging.warning(f"403 Forbidden, retrying in {backoff_factor * (2 ** attempt)} seconds")
-                    time.sleep(backoff_factor * (2 ** attempt))
-                else:
-                    logging.error(f"Request error: {str(e)}")
-                    return None
+                sink.close()
             except Exception as e:
-                logging.error(f"Request error: {str(e)}")
+                logging.error(f"{sink.name} sink error: {str(e)}")
+
+    def new_session(self):
+        session = requests.Session()
+        session.headers.update(get_random_header())
+        return session
+
+    @contextmanager
+    def session(self):
+        # Une session par requête en cours, rendue au pool ensuite (la plus récente d'abord)
+        try:
+            session = self._sessions.get_nowait()
+        except queue.Empty:
+            session = self.new_session()
+        try:
+            yield session
+        finally:
+            self._sessions.put(session)
+
+    def safe_request(self, url, params=None, retries=3, backoff_factor=0.5, method='GET', data=None):
+        # Requêtes identiques en vol (autre requête du lot, autre source) : une seule part,
+        # les autres attendent et reçoivent la même réponse
+        key = json.dumps([method.upper(), url, params, data], sort_keys=True, default=str)
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = Future()
+        if not leader:
+            self.metrics.inc('coalesced_requests_total', host=host_of(url))
+            return pending.result()
+        try:
+            response = self._request(url, params, retries, backoff_factor, method, data)
+            pending.set_result(response)
+            return response
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _request(self, url, params=None, retries=3, backoff_factor=0.5, method='GET', data=None):
+        cache = self.response_cache
+        key = cached = None
+        if cache:
+            key = cache.key(method, url, params, data)
+            cached = cache.get(key)
+            if cached is not None and (cache.offline or cache.is_fresh(cached)):
+                cache.stats['hits'] += 1
+                return cached.response()
+            if cache.offline:
+                cache.stats['misses'] += 1
+                logging.warning(f"Offline mode: no cached response for {url}")
                 return None
+            cache.stats['misses'] += 1
 
-    def arxiv_scraper(self, query, max_results=500):
-        results = []
-        url = "http://export.arxiv.org/api/query"
-        params = {'search_query': query, 'max_results': max_results}
-        
-        response = self.safe_request(url, params)
-        if not response:
-            return results
+        policy = self.rate_limiter.policy(url)
+        if not policy.breaker.allow():
+            policy.stats['short_circuited'] += 1
+            logging.debug(f"Circuit open for {policy.host}, skipping {url}")
+            return None
 
-        soup = BeautifulSoup(response.text, 'lxml-xml')
-        for entry in soup.find_all('entry'):
-            try:
-                title = entry.title.text.strip() if entry.title else 'Untitled'
-                if is_duplicate(title):
-                    continue
-                
-                publication = {
-                    'title': title,
-                    'authors': [a.find('name').text for a in entry.find_all('author') if a.find('name')],
-                    'year': int(entry.published.text[:4]) if entry.published else None,
-                    'journal': 'ArXiv',
-                    'abstract': entry.summary.text.strip() if entry.summary else '',
-                    'link': entry.id.text if entry.id else '',
-                    'keywords': [cat['term'] for cat in entry.find_all('category')],
-                    'entities': extract_entities(entry.summary.text if entry.summary else ''),
-                    'source': 'arXiv'
-                }
-                results.append(publication)
-            except Exception as e:
-                logging.error(f"ArXiv processing error: {str(e)}")
+        with policy.concurrency:
+            for attempt in range(retries):
+                if attempt and policy.breaker.state == 'open':
+                    break
+                try:
+                    policy.bucket.acquire()
+                    policy.stats['requests'] += 1
+                    start = time.perf_counter()
+                    with self.session() as session:
+                        response = session.request(
+                            method, url, params=params, data=data, timeout=30,  # Increased timeout
+                            headers=ResponseCache.validators(cached)
+                        )
+                    self.metrics.observe('request_seconds', time.perf_counter() - start, host=policy.host)
+                    self.metrics.inc('responses_total', host=policy.host, status=response.status_code)
+                    self.metrics.inc('bytes_downloaded_total', len(response.content), host=policy.host)
+                    if response.status_code == 304 and cached is not None:
+                        policy.on_success()
+                        cache.touch(key)
+                        return cached.response()
+                    response.raise_for_status()
+                    policy.on_success()
+                    if cache:
+                        cache.put(key, response)
+                    return response
+                except requests.exceptions.HTTPError as e:
+                    if e.response.status_code not in THROTTLE_STATUSES:
+                        # 4xx : l'hôte répond, seule la requête est en cause
+                        if e.response.status_code >= 500:
+                            policy.on_failure()
+                        else:
+                            policy.breaker.record_success()
+                        logging.error(f"Request error: {str(e)}")
+                        return None
+                    # Retry-After prioritaire, sinon backoff exponentiel ; l'attente passe par le seau de l'hôte
+                    delay = retry_after_seconds(e.response)
+                    if delay is None:
+                        delay = backoff_factor * (2 ** attempt)
+                    policy.stats['retries'] += 1
+                    policy.on_throttle(delay)
+                    logging.warning(f"{e.response.status_code} from {policy.host}, retrying in {delay:.1f} seconds")
+                except Exception as e:
+                    policy.on_failure()
+                    logging.error(f"Request error: {str(e)}")
+                    return None
 
-        self._save_results(results)
-        return results
+        logging.error(f"Giving up on {url} after {retries} attempts ({policy.snapshot()})")
+        return None
 
-    def openalex_scraper(self, query, email, max_results=500):
-        results = []
+    def request_stats(self):
+        return self.rate_limiter.stats()
+
+    def _collect_metrics(self):
+        # Compteurs tenus par les hôtes, les caches, l'écrivain MongoDB et la liaison
+        for host, stats in self.request_stats().items():
+            for field, value in stats.items():
+                if isinstance(value, int):
+                    yield f"host_{field}_total", {'host': host}, value
+        if self.response_cache:
+            for field, value in self.response_cache.stats.items():
+                yield f"http_cache_{field}_total", {}, value
+        for field, value in self.entity_cache.stats.items():
+            yield f"ner_cache_{field}_total", {}, value
+        if self._writer is not None:
+            for field in ('batches', 'upserted', 'matched', 'modified', 'failed'):
+                yield f"mongo_{field}_total", {}, self._writer.stats[field]
+        if self._linker is not None:
+            for match, value in self._linker.stats.items():
+                yield 'linked_records_total', {'match': match}, value
+        for sink in self._sinks or ():
+            for field, value in getattr(sink, 'stats', {}).items():
+                yield f"export_{field}_total", {'sink': sink.name}, value
+
+    def is_duplicate(self, publication):
+        # Clé (source, titre) déjà enregistrée ; les anciens documents reçoivent leurs clés
+        # avant le chargement de l'index
+        if self.uses_mongo:
+            self.linker.ensure_ready()
+        return dedup_key(publication) in self.dedup_index
+
+    # --- Téléchargement : chaque source produit ses pages brutes au fil de l'eau ---
+    # state.page(position) avant chaque page permet la reprise ; state.failed marque un crawl incomplet
+    def _fetch_arxiv(self, query, max_results=500, state=None):
+        state = state or CrawlState()
+        url = "http://export.arxiv.org/api/query"
+        params = {'search_query': query}
+        if state.watermark:
+            # Crawl incrémental : les plus récemment modifiés d'abord, arrêt au watermark
+            params.update(sortBy='lastUpdatedDate', sortOrder='descending')
+        total = max_results
+        for start in range(state.position or 0, max_results, ARXIV_PAGE_SIZE):
+            if start >= total:
+                break
+            response = self.safe_request(url, {**params, 'start': start, 'max_results': min(ARXIV_PAGE_SIZE, total - start)})
+            if not response:
+                state.failed = True
+                return
+            found = re.search(r'<opensearch:totalResults[^>]*>(\d+)<', response.text)
+            if found:
+                total = min(total, int(found.group(1)))
+            state.page(start + ARXIV_PAGE_SIZE)
+            yield response.text
+            if state.watermark:
+                updated = ARXIV_UPDATED.findall(response.text)
+                if updated and min(updated)[:10] < state.watermark:
+                    break
+
+    def _fetch_openalex(self, query, email, max_results=500, state=None, prefetch=True):
+        # prefetch=False : pas de téléchargement anticipé de la page suivante (une page par tâche)
+        state = state or CrawlState()
         url = "https://api.openalex.org/works"
+        filters = f'title.search:{query}'
+        if state.watermark:
+            filters += f',{OPENALEX_WATERMARK_FILTER}:{state.watermark}'
         params = {
-            'filter': f'title.search:{query}',
+            'filter': filters,
             'mailto': email,
-            'per_page': 200
+            'select': OPENALEX_SELECT
         }
 
-        for page in range(1, (max_results // 200) + 2):
-            params['page'] = page
-            response = self.safe_request(url, params)
-            if not response:
-                continue
+        def fetch(cursor, remaining):
+            return self.safe_request(url, {**params, 'per_page': min(OPENALEX_PAGE_SIZE, remaining), 'cursor': cursor})
 
-            data = response.json()
-            for work in data.get('results', []):
-                try:
-                    title = work.get('title', 'Untitled')
-                    if is_duplicate(title):
-                        continue
+        # Pagination par curseur : la page suivante est téléchargée pendant le traitement de la courante
+        fetched = 0
+        if max_results <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(fetch, state.position or '*', max_results)
+            while next_page is not None:
+                response, next_page = next_page.result(), None
+                if not response:
+                    state.failed = True
+                    return
 
-                    publication = {
-                        'title': title,
-                        'authors': [a.get('author', {}).get('display_name') for a in work.get('authorships', [])],
-                        'year': int(work.get('publication_date', '0000')[:4]) if work.get('publication_date') else None,
-                        'journal': work.get('primary_location', {}).get('source', {}).get('display_name', 'Unknown'),
-                        'abstract': work.get('abstract', ''),
-                        'link': work.get('doi', ''),
-                        'keywords': [kw.get('display_name') for kw in work.get('keywords', [])],
-                        'entities': extract_entities(work.get('abstract', '')),
-                        'source': 'OpenAlex'
-                    }
-                    results.append(publication)
-                except Exception as e:
-                    logging.error(f"OpenAlex processing error: {str(e)}")
+                data = response.json()
+                works = data.get('results', [])[:max_results - fetched]
+                fetched += len(works)
+                cursor = data.get('meta', {}).get('next_cursor')
+                if cursor and works and fetched < max_results and prefetch:
+                    next_page = executor.submit(fetch, cursor, max_results - fetched)
+                state.page(cursor)
+                yield works
 
-            if len(results) >= max_results:
-                break
+    def _fetch_pubmed(self, query, max_results=500, state=None):
+        return self._fetch_ncbi('pubmed', query, max_results, state)
 
-        self._save_results(results)
-        return results
+    def _fetch_medline(self, query, max_results=500, state=None):
+        return self._fetch_ncbi('medline', query, max_results, state)
 
-    def pubmed_scraper(self, query, max_results=500):
-        results = []
+    def _fetch_ncbi(self, db, query, max_results, state=None):
+        state = state or CrawlState()
+        if self.ncbi_seen is not None:
+            yield from self._fetch_ncbi_ids(db, query, max_results, state)
+            return
         base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
-        
-        # Phase de recherche
-        search_params = {
-            'db': 'pubmed',
-            'term': query,
-            'retmax': max_results
-        }
-        response = self.safe_request(f"{base_url}esearch.fcgi", search_params)
+        api_params = {'api_key': self.ncbi_api_key} if self.ncbi_api_key else {}
+
+        # Phase de recherche : les IDs restent sur le serveur d'historique NCBI
+        history = self._ncbi_search(db, query, state.watermark)
+        if history is None:
+            state.failed = True
+            return
+        web_env, query_key, count = history
+        total = min(count, max_results)
+        logging.info(f"{db}: {total} articles to fetch in batches of {self.ncbi_batch_size}")
+
+        # Phase de récupération des détails : POST par lots, plusieurs lots en parallèle
+        def fetch(retstart):
+            fetch_data = {
+                'db': db,
+                'WebEnv': web_env,
+                'query_key': query_key,
+                'retstart': retstart,
+                'retmax': min(self.ncbi_batch_size, total - retstart),
+                'retmode': 'xml',
+                **api_params
+            }
+            return self.safe_request(f"{base_url}efetch.fcgi", method='POST', data=fetch_data)
+
+        with ThreadPoolExecutor(max_workers=self.ncbi_concurrency) as executor:
+            retstarts = range(state.position or 0, total, self.ncbi_batch_size)
+            for retstart, response in zip(retstarts, bounded_map(executor, fetch, retstarts, self.ncbi_concurrency)):
+                if not response:
+                    state.failed = True
+                    return
+                state.page(retstart + self.ncbi_batch_size)
+                yield response.content
+
+    def _ncbi_search(self, db, query, watermark=None):
+        # esearch sur le serveur d'historique : (WebEnv, query_key, nombre de résultats), None en cas d'échec
+        search_params = {'db': db, 'term': query, 'usehistory': 'y', 'retmax': 0}
+        if self.ncbi_api_key:
+            search_params['api_key'] = self.ncbi_api_key
+        if watermark:
+            # Crawl incrémental : uniquement les notices modifiées depuis le watermark
+            search_params.update(datetype='mdat', mindate=watermark.replace('-', '/'), maxdate='3000')
+        response = self.safe_request("https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi", search_params)
         if not response:
-            return results
-
-        soup = BeautifulSoup(response.text, 'lxml-xml')
-        ids = [id.text for id in soup.find_all('Id')]
-
-        # Phase de récupération des détails
-        for i in range(0, len(ids), 100):
-            batch_ids = ids[i:i+100]
-            fetch_params = {
-                'db': 'pubmed',
-                'id': ','.join(batch_ids),
-                'retmode': 'xml'
+            return None
+        search = etree.fromstring(response.content)
+        web_env, query_key = search.findtext('WebEnv'), search.findtext('QueryKey')
+        if not web_env or not query_key:
+            logging.error(f"{db} search error: {search.findtext('.//ERROR') or 'no WebEnv returned'}")
+            return None
+        return web_env, query_key, int(search.findtext('Count') or 0)
+
+    def _ncbi_history_ids(self, db, history, start, stop):
+        # IDs [start, stop) d'un résultat du serveur d'historique (efetch rettype=uilist), None en cas d'échec
+        web_env, query_key, _ = history
+        ids = []
+        while start + len(ids) < stop:
+            data = {
+                'db': db, 'WebEnv': web_env, 'query_key': query_key, 'rettype': 'uilist', 'retmode': 'text',
+                'retstart': start + len(ids), 'retmax': min(NCBI_ID_BATCH_SIZE, stop - start - len(ids)),
             }
-            response = self.safe_request(f"{base_url}efetch.fcgi", fetch_params)
+            if self.ncbi_api_key:
+                data['api_key'] = self.ncbi_api_key
+            response = self.safe_request(
+                "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi", method='POST', data=data
+            )
             if not response:
-                continue
+                return None
+            page = response.text.split()
+            if not page:
+                break
+            ids.extend(page)
+        return ids
 
-            details_soup = BeautifulSoup(response.text, 'lxml-xml')
-            for article in details_soup.find_all('PubmedArticle'):
-                try:
-                    title = article.find('ArticleTitle').text.strip() if article.find('ArticleTitle') else 'Untitled'
-                    if is_duplicate(title):
-                        continue
+    def _ncbi_ids(self, db, query, max_results, watermark=None):
+        # Liste complète des IDs (None en cas d'échec)
+        history = self._ncbi_search(db, query, watermark)
+        if history is None:
+            return None
+        ids = self._ncbi_history_ids(db, history, 0, min(history[2], max_results))
+        if ids is not None:
+            logging.info(f"{db}: {len(ids)} articles to fetch in batches of {self.ncbi_batch_size}")
+        return ids
 
-                    publication = {
-                        'title': title,
-                        'authors': [f"{auth.find('LastName').text} {auth.find('ForeName').text}".strip() 
-                                   for auth in article.find_all('Author') if auth.find('LastName') and auth.find('ForeName')],
-                        'year': int(article.find('PubDate').Year.text) if article.find('PubDate') and article.find('PubDate').Year else None,
-                        'journal': article.find('Journal').Title.text if article.find('Journal') and article.find('Journal').Title else '',
-                        'abstract': ' '.join([t.text for t in article.find_all('AbstractText')]) if article.find_all('AbstractText') else '',
-                        'link': f"https://pubmed.ncbi.nlm.nih.gov/{article.find('PMID').text}/" if article.find('PMID') else '',
-                        'keywords': [kw.text for kw in article.find_all('Keyword')] if article.find_all('Keyword') else [],
-                        'entities': extract_entities(' '.join([t.text for t in article.find_all('AbstractText')])),
-                        'source': 'PubMed'
-                    }
-                    results.append(publication)
-                except Exception as e:
-                    logging.error(f"PubMed processing error: {str(e)}")
+    def _ncbi_efetch(self, db, ids):
+        data = {'db': db, 'id': ','.join(ids), 'retmode': 'xml'}
+        if self.ncbi_api_key:
+            data['api_key'] = self.ncbi_api_key
+        return self.safe_request("https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi", method='POST', data=data)
 
-        self._save_results(results)
-        return results
+    def _fetch_ncbi_ids(self, db, query, max_results, state):
+        # Mode lot : la liste d'IDs est récupérée pour que les PMIDs communs à plusieurs requêtes
+        # ne soient téléchargés qu'une fois ; la position reste l'index dans la liste complète
+        ids = self._ncbi_ids(db, query, max_results, state.watermark)
+        if ids is None:
+            state.failed = True
+            return
 
-    def scilit_scraper(self, query, max_results=500):
-        results = []
-        url = "https://scilit.net/api/v1/search"
+        def fetch(retstart):
+            # Les IDs sont réservés pendant le téléchargement et ne sont marqués vus qu'une fois
+            # téléchargés : après un échec, les requêtes suivantes du lot les récupèrent encore
+            chunk = ids[retstart:retstart + self.ncbi_batch_size]
+            with self._ncbi_seen_lock:
+                batch = [pmid for pmid in chunk
+                         if (db, pmid) not in self.ncbi_seen and (db, pmid) not in self._ncbi_pending]
+                keys = [(db, pmid) for pmid in batch]
+                self._ncbi_pending.update(keys)
+            self.metrics.inc('ncbi_shared_ids_total', len(chunk) - len(batch), db=db)
+            if not batch:
+                return retstart, batch, None
+            response = None
+            try:
+                response = self._ncbi_efetch(db, batch)
+            finally:
+                with self._ncbi_seen_lock:
+                    self._ncbi_pending.difference_update(keys)
+                    if response:
+                        self.ncbi_seen.update(keys)
+            return retstart, batch, response
+
+        with ThreadPoolExecutor(max_workers=self.ncbi_concurrency) as executor:
+            retstarts = range(state.position or 0, len(ids), self.ncbi_batch_size)
+            for retstart, batch, response in bounded_map(executor, fetch, retstarts, self.ncbi_concurrency):
+                if not batch:
+                    continue  # IDs déjà récupérés par une autre requête du lot
+                if not response:
+                    state.failed = True
+                    return
+                state.page(retstart + self.ncbi_batch_size)
+                yield response.content
+
+    def _fetch_single(self, url, params, state=None):
+        response = self.safe_request(url, params)
+        if response:
+            if state is not None:
+                state.page(None)  # page unique : terminée seulement une fois enregistrée
+            yield response.text
+        elif state is not None:
+            state.failed = True
+
+    def _fetch_scilit(self, query, max_results=500, state=None):
+        return self._fetch_single("https://scilit.net/api/v1/search", {'q': query, 'limit': max_results}, state)
+
+    def _fetch_google_scholar(self, query, max_results=20, state=None):
+        state = state or CrawlState()
+        url = "https://scholar.google.com/scholar"
+        for start in range(state.position or 0, max_results, GOOGLE_SCHOLAR_PAGE_SIZE):
+            response = self.safe_request(url, {'start': start, 'q': query})
+            if not response:
+                state.failed = True
+                return
+            state.page(start + GOOGLE_SCHOLAR_PAGE_SIZE)
+            yield response.text
+
+    def _fetch_springer(self, query, max_results=500, state=None):
+        return self._fetch_single("https://link.springer.com/search", {'query': query, 'show': max_results}, state)
+
+    def _fetch_hal(self, query, max_results=500, state=None):
+        return self._fetch_single("https://hal.archives-ouvertes.fr/search/index/", {'q': query, 'rows': max_results}, state)
+
+    def _fetch_researchgate(self, query, max_results=500, state=None):
+        url = "https://www.researchgate.net/search"
         params = {
             'q': query,
+            'type': 'publication',
+            'offset': 0,
             'limit': max_results
         }
+        return self._fetch_single(url, params, state)
 
-        response = self.safe_request(url, params)
-        if not response:
-            return results
+    def _fetch_citeseerx(self, query, max_results=500, state=None):
+        url = "http://citeseerx.ist.psu.edu/search"
+        params = {
+            'q': query,
+            'start': 0,
+            'rows': max_results
+        }
+        return self._fetch_single(url, params, state)
 
-        data = response.json()
-        for item in data.get('results', []):
-            try:
-                title = item.get('title', 'Untitled')
-                if is_duplicate(title):
-                    continue
+    # --- Flux d'enregistrements normalisés ---
+    def _crawl_state(self, name, query):
+        return self.checkpoints.open(name, query) if self.checkpoints else CrawlState(source=name, query=query)
 
-                publication = {
-                    'title': title,
-                    'authors': [author.get('name') for author in item.get('authors', [])],
-                    'year': item.get('year'),
-                    'journal': item.get('journal'),
-                    'abstract': item.get('abstract', ''),
-                    'link': item.get('doi', ''),
-                    'keywords': item.get('keywords', []),
-                    'entities': extract_entities(item.get('abstract', '')),
-                    'source': 'Scilit'
-                }
-                results.append(publication)
+    def _parse_page(self, name, page):
+        records = []
+        with self.metrics.timer('parse_seconds', source=name):
+            try:
+                for publication in SOURCES[name](page):
+                    records.append(publication)
             except Exception as e:
-                logging.error(f"Scilit processing error: {str(e)}")
+                logging.error(f"{name} parsing error: {str(e)}")
+        self.metrics.inc('records_parsed_total', len(records), source=name)
+        return self._drop_unchanged(name, records)
 
-        self._save_results(results)
-        return results
+    def _drop_unchanged(self, name, records):
+        # Avant NER et écriture : les clés connues (index en mémoire) sont vérifiées par empreinte
+        # de contenu en un seul lot ; seuls les enregistrements nouveaux ou modifiés continuent
+        with self.metrics.timer('dedup_seconds', source=name):
+            known = [publication for publication in records if self.is_duplicate(publication)]
+            if not self.uses_mongo:
+                unchanged = {dedup_key(publication) for publication in known}  # déjà exportés
+            else:
+                unchanged = self.linker.unchanged(known) if known else set()
+            fresh = [publication for publication in records if dedup_key(publication) not in unchanged]
+        self.metrics.inc('duplicates_skipped_total', len(records) - len(fresh), source=name)
+        self.metrics.inc('changed_records_total', len(known) - (len(records) - len(fresh)), source=name)
+        return fresh
 
-    def google_scholar_scraper(self, query, max_results=20):
-        results = []
-        for start in range(0, max_results, 10):
-            url = f"https://scholar.google.com/scholar?start={start}&q={query}"
-            response = self.safe_request(url)
-            if not response:
+    def iter_pages(self, name, query, state=None, **kwargs):
+        # (enregistrements, numéro de page) ; state.done(numéro) une fois la page enregistrée
+        state = state or CrawlState(source=name, query=query)
+        for page in getattr(self, f'_fetch_{name}')(query, state=state, **kwargs):
+            seq = state.last_seq
+            records = self._parse_page(name, page)
+            self._extract_entities(records, name)
+            yield records, seq
+
+    def iter_source(self, name, query, **kwargs):
+        for records, _ in self.iter_pages(name, query, **kwargs):
+            yield from records
+
+    def save_stream(self, records, chunk_size=None):
+        # Enregistre un flux par morceaux : la mémoire reste bornée quelle que soit la taille du flux
+        count = 0
+        for chunk in chunked(records, chunk_size or self.mongo_batch_size, self.mongo_flush_interval):
+            if self._save_results(chunk):
+                count += len(chunk)
+        return count
+
+    def crawl_source(self, name, query, collect=True, **kwargs):
+        # Enregistre page par page et fait avancer le point de reprise de (source, requête)
+        state = self._crawl_state(name, query)
+        results, count = [], 0
+        for records, seq in self.iter_pages(name, query, state=state, **kwargs):
+            saved = self._save_results(records)
+            state.done(seq, saved)
+            if not saved:
                 continue
+            count += len(records)
+            if collect:
+                results.extend(records)
+        state.exhausted()
+        return results if collect else count
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            for item in soup.find_all('div', class_='gs_ri'):
-                try:
-                    title = item.find('h3').text.strip()
-                    if is_duplicate(title):
-                        continue
+    def profile_source(self, name, query, output=None, profiler='cprofile', **kwargs):
+        # Profil d'une seule source (thread appelant uniquement) ; renvoie (nombre, rapport texte).
+        # output : fichier .prof (cProfile) ou .html (pyinstrument)
+        if profiler == 'pyinstrument':
+            if pyinstrument is None:
+                raise ValueError("pyinstrument is not installed")
+            profile = pyinstrument.Profiler()
+            profile.start()
+            try:
+                count = self.crawl_source(name, query, collect=False, **kwargs)
+            finally:
+                profile.stop()
+            if output:
+                with open(output, 'w') as f:
+                    f.write(profile.output_html())
+            return count, profile.output_text()
 
-                    publication = {
-                        'title': title,
-                        'authors': item.find('div', class_='gs_a').text if item.find('div', class_='gs_a') else '',
-                        'source': 'Google Scholar',
-                        'link': item.find('a')['href'] if item.find('a') else ''
-                    }
-                    results.append(publication)
-                except Exception as e:
-                    logging.error(f"Google Scholar processing error: {str(e)}")
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            count = self.crawl_source(name, query, collect=False, **kwargs)
+        finally:
+            profile.disable()
+        if output:
+            profile.dump_stats(output)
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        return count, report.getvalue()
 
-        self._save_results(results)
-        return results
+    # --- Interface historique : une liste par source ---
+    def arxiv_scraper(self, query, max_results=500):
+        return self.crawl_source('arxiv', query, max_results=max_results)
 
-    def springer_scraper(self, query, max_results=500):
-        results = []
-        url = "https://link.springer.com/search"
-        params = {
-            'query': query,
-            'show': max_results
-        }
+    def openalex_scraper(self, query, email, max_results=500):
+        return self.crawl_source('openalex', query, email=email, max_results=max_results)
 
-        response = self.safe_request(url, params)
-        if not response:
-            return results
+    def pubmed_scraper(self, query, max_results=500):
+        return self.crawl_source('pubmed', query, max_results=max_results)
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        for item in soup.find_all('li', class_='result-item'):
-            try:
-                title = item.find('h2').text.strip()
-                if is_duplicate(title):
-                    continue
+    def scilit_scraper(self, query, max_results=500):
+        return self.crawl_source('scilit', query, max_results=max_results)
 
-                publication = {
-                    'title': title,
-                    'authors': [author.text.strip() for author in item.find_all('span', class_='authors')] if item.find_all('span', class_='authors') else [],
-                    'year': item.find('span', class_='year').text.strip() if item.find('span', class_='year') else '',
-                    'journal': item.find('span', class_='journal').text.strip() if item.find('span', class_='journal') else '',
-                    'link': item.find('a')['href'] if item.find('a') else '',
-                    'source': 'Springer'
-                }
-                results.append(publication)
-            except Exception as e:
-                logging.error(f"Springer processing error: {str(e)}")
+    def google_scholar_scraper(self, query, max_results=20):
+        return self.crawl_source('google_scholar', query, max_results=max_results)
 
-        self._save_results(results)
-        return results
+    def springer_scraper(self, query, max_results=500):
+        return self.crawl_source('springer', query, max_results=max_results)
 
     def hal_scraper(self, query, max_results=500):
-        results = []
-        url = "https://hal.archives-ouvertes.fr/search/index/"
-        params = {
-            'q': query,
-            'rows': max_results
-        }
+        return self.crawl_source('hal', query, max_results=max_results)
 
-        response = self.safe_request(url, params)
-        if not response:
-            return results
+    def medline_scraper(self, query, max_results=500):
+        return self.crawl_source('medline', query, max_results=max_results)
+
+    def researchgate_scraper(self, query, max_results=500):
+        return self.crawl_source('researchgate', query, max_results=max_results)
+
+    def citeseerx_scraper(self, query, max_results=500):
+        return self.crawl_source('citeseerx', query, max_results=max_results)
+
+    def run_all(self, query, sources=None, max_workers=None, max_results=None, email=None, collect=True):
+        sources = self._check_sources(sources)
+        summary = {'query': query, 'results': {}, 'counts': {}, 'errors': {}, 'durations': {}}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers or len(sources)) as executor:
+            futures = {
+                executor.submit(self._run_source, name, query, max_results, email, collect): name
+                for name in sources
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results, count, duration = future.result()
+                    summary['results'][name] = results
+                    summary['counts'][name] = count
+                    summary['durations'][name] = duration
+                except Exception as e:
+                    summary['results'][name] = []
+                    summary['counts'][name] = 0
+                    summary['errors'][name] = str(e)
+                    logging.error(f"{name} failed: {str(e)}")
+
+        summary['total'] = sum(summary['counts'].values())
+        summary['elapsed'] = time.perf_counter() - start
+        summary['hosts'] = self.request_stats()
+        logging.info(f"Collected {summary['total']} publications from {len(sources)} sources in {summary['elapsed']:.1f}s")
+        return summary
+
+    def run_pipeline(self, query, sources=None, max_results=None, email=None, workers=None,
+                     queue_size=PIPELINE_QUEUE_SIZE, processes=None, process_pool=None):
+        # processes=N : parsing et NER partent dans un pool de N processus (contourne le GIL) ;
+        # process_pool : pool existant de `processes` processus, partagé entre plusieurs appels (mode lot)
+        sources = self._check_sources(sources)
+        if process_pool is not None and not processes:
+            raise ValueError("run_pipeline needs processes (the pool size) with process_pool")
+        executor = process_pool
+        if processes and executor is None:
+            executor = self._process_pool(processes)
+        # Étape process : un thread par processus du pool
+        workers = {'fetch': len(sources), 'process': processes, **PIPELINE_WORKERS, **(workers or {})}
+        counts = dict.fromkeys(sources, 0)
+        lock = threading.Lock()
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        for item in soup.find_all('div', class_='record'):
+        def fetch(name):
             try:
-                title = item.find('h2').text.strip()
-                if is_duplicate(title):
-                    continue
+                kwargs = self._source_kwargs(name, max_results, email)
+            except ValueError as e:
+                logging.error(f"{name} skipped: {str(e)}")
+                return
+            state = self._crawl_state(name, query)
+            start = time.perf_counter()
+            try:
+                for page in getattr(self, f'_fetch_{name}')(query, state=state, **kwargs):
+                    yield name, page, state, state.last_seq
+            except Exception:
+                state.failed = True
+                raise
+            finally:
+                state.exhausted()
+                self.metrics.observe('source_fetch_seconds', time.perf_counter() - start, source=name)
 
-                publication = {
-                    'title': title,
-                    'authors': [author.text.strip() for author in item.find_all('span', class_='author')] if item.find_all('span', class_='author') else [],
-                    'year': item.find('span', class_='year').text.strip() if item.find('span', class_='year') else '',
-                    'journal': item.find('span', class_='journal').text.strip() if item.find('span', class_='journal') else '',
-                    'link': item.find('a')['href'] if item.find('a') else '',
-                    'source': 'HAL'
-                }
-                results.append(publication)
-            except Exception as e:
-                logging.error(f"HAL processing error: {str(e)}")
+        # Chaque page avance jusqu'au stockage, même vide, pour confirmer son point de reprise
+        def parse(item):
+            name, page, state, seq = item
+            yield name, self._parse_page(name, page), state, seq
 
-        self._save_results(results)
-        return results
+        def ner(item):
+            self._extract_entities(item[1], item[0])
+            yield item
 
-    def medline_scraper(self, query, max_results=500):
-        results = []
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
-        
-        # Phase de recherche
-        search_params = {
-            'db': 'medline',
-            'term': query,
-            'retmax': max_results
+        def process(item):
+            name, page, state, seq = item
+            with self.metrics.timer('process_seconds', source=name):
+                _, records = executor.submit(process_page, name, page, self.ner_batch_size, False).result()
+                self.metrics.inc('records_parsed_total', len(records), source=name)
+                records = self._drop_unchanged(name, records)
+                if records:
+                    records = executor.submit(annotate_records, records, self.ner_batch_size).result()
+            yield name, records, state, seq
+
+        def store(item):
+            name, records, state, seq = item
+            saved = self._save_results(records)
+            state.done(seq, saved)
+            if not saved:
+                return
+            with lock:
+                counts[name] += len(records)
+
+        if executor is not None:
+            middle = [PipelineStage('process', process, workers['process'], queue_size)]
+        else:
+            middle = [
+                PipelineStage('parse', parse, workers['parse'], queue_size),
+                PipelineStage('ner', ner, workers['ner'], queue_size),
+            ]
+        # Un pipeline par appel : run_jobs en exécute plusieurs en parallèle
+        pipeline = Pipeline([
+            PipelineStage('fetch', fetch, workers['fetch'], queue_size),
+            *middle,
+            PipelineStage('store', store, workers['store'], queue_size),
+        ], metrics=self.metrics)
+        start = time.perf_counter()
+        try:
+            stages = pipeline.run(sources)
+        finally:
+            if executor is not None and executor is not process_pool:
+                executor.shutdown()
+        summary = {
+            'query': query,
+            'counts': counts,
+            'total': sum(counts.values()),
+            'stages': stages,
+            'hosts': self.request_stats(),
+            'elapsed': time.perf_counter() - start,
         }
-        response = self.safe_request(f"{base_url}esearch.fcgi", search_params)
-        if not response:
-            return results
-
-        soup = BeautifulSoup(response.text, 'lxml-xml')
-        ids = [id.text for id in soup.find_all('Id')]
-
-        # Phase de récupération des détails
-        for i in range(0, len(ids), 100):
-            batch_ids = ids[i:i+100]
-            fetch_params = {
-                'db': 'medline',
-                'id': ','.join(batch_ids),
-                'retmode': 'xml'
-            }
-            response = self.safe_request(f"{base_url}efetch.fcgi", fetch_params)
-            if not response:
-                continue
+        logging.info(f"Pipeline stored {summary['total']} publications in {summary['elapsed']:.1f}s ({stages})")
+        return summary
 
-            details_soup = BeautifulSoup(response.text, 'lxml-xml')
-            for article in details_soup.find_all('MedlineCitation'):
-                try:
-                    title = article.find('ArticleTitle').text.strip() if article.find('ArticleTitle') else 'Untitled'
-                    if is_duplicate(title):
-                        continue
+    def _process_pool(self, processes):
+        # Aucune écriture du cache NER en attente côté parent pendant que les workers écrivent
+        self.entity_cache.flush()
+        return ProcessPoolExecutor(
+            processes,
+            mp_context=multiprocessing.get_context(PROCESS_START_METHOD),
+            initializer=_init_process_worker,
+            initargs=(self.entity_cache.path, self.config.ner_model),
+        )
 
-                    publication = {
-                        'title': title,
-                        'authors': [f"{auth.find('LastName').text} {auth.find('ForeName').text}".strip() 
-                                   for auth in article.find_all('Author') if auth.find('LastName') and auth.find('ForeName')],
-                        'year': int(article.find('PubDate').Year.text) if article.find('PubDate') and article.find('PubDate').Year else None,
-                        'journal': article.find('Journal').Title.text if article.find('Journal') and article.find('Journal').Title else '',
-                        'abstract': ' '.join([t.text for t in article.find_all('AbstractText')]) if article.find_all('AbstractText') else '',
-                        'link': f"https://pubmed.ncbi.nlm.nih.gov/{article.find('PMID').text}/" if article.find('PMID') else '',
-                        'keywords': [kw.text for kw in article.find_all('Keyword')] if article.find_all('Keyword') else [],
-                        'entities': extract_entities(' '.join([t.text for t in article.find_all('AbstractText')])),
-                        'source': 'Medline'
-                    }
-                    results.append(publication)
-                except Exception as e:
-                    logging.error(f"Medline processing error: {str(e)}")
+    def run_jobs(self, jobs, email=None, concurrency=JOB_CONCURRENCY, processes=None):
+        # Mode lot : plusieurs requêtes dans un même processus, avec un seul modèle spaCy, un pool
+        # de sessions, un index de dédoublonnage, un cache NER et un pool de processus partagés.
+        # Les requêtes identiques en vol sont fusionnées (safe_request), les PMIDs communs
+        # ne sont téléchargés qu'une fois.
+        jobs = [job if isinstance(job, dict) else {'query': job} for job in jobs]
+        executor = self._process_pool(processes) if processes else None
+        self.ncbi_seen = set()
+        coalesced = self.metrics.total('coalesced_requests_total')
 
-        self._save_results(results)
-        return results
+        def run(job):
+            summary = self.run_pipeline(
+                job['query'], job.get('sources'), job.get('max_results'), job.get('email') or email,
+                processes=processes, process_pool=executor,
+            )
+            summary['records_per_sec'] = summary['total'] / summary['elapsed'] if summary['elapsed'] else 0.0
+            logging.info(f"Job '{job['query']}': {summary['total']} publications, "
+                         f"{summary['records_per_sec']:.1f} records/s")
+            return summary
 
-    def researchgate_scraper(self, query, max_results=500):
-        results = []
-        url = "https://www.researchgate.net/search"
-        params = {
-            'q': query,
-            'type': 'publication',
-            'offset': 0,
-            'limit': max_results
+        start = time.perf_counter()
+        summaries = []
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                futures = [pool.submit(run, job) for job in jobs]
+                for job, future in zip(jobs, futures):
+                    try:
+                        summaries.append(future.result())
+                    except Exception as e:
+                        logging.error(f"Job '{job['query']}' failed: {str(e)}")
+                        summaries.append({'query': job['query'], 'error': str(e), 'total': 0})
+        finally:
+            self.ncbi_seen = None
+            if executor is not None:
+                executor.shutdown()
+
+        elapsed = time.perf_counter() - start
+        total = sum(summary['total'] for summary in summaries)
+        summary = {
+            'jobs': summaries,
+            'total': total,
+            'elapsed': elapsed,
+            'records_per_sec': total / elapsed if elapsed else 0.0,
+            'coalesced_requests': self.metrics.total('coalesced_requests_total') - coalesced,
+            'hosts': self.request_stats(),
         }
+        logging.info(f"Batch of {len(jobs)} queries stored {total} publications in {elapsed:.1f}s "
+                     f"({summary['records_per_sec']:.1f} records/s)")
+        return summary
 
-        response = self.safe_request(url, params)
-        if not response:
-            return results
+    # --- Mode distribué : tâches partagées par plusieurs workers via TaskQueue ---
+    def _max_results(self, name, options):
+        return options.get('max_results') or inspect.signature(getattr(self, f'_fetch_{name}')).parameters['max_results'].default
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        for item in soup.find_all('div', class_='publication-item'):
+    def plan_tasks(self, name, query, max_results=None, email=None):
+        # Tâches initiales d'une (source, requête) : toutes les pages d'offset, la première page
+        # des sources à curseur, la recherche NCBI ; les suivantes sont produites par run_task
+        # (NCBI : tranches d'IDs listées sur le serveur d'historique, puis lots efetch)
+        options = self._source_kwargs(name, max_results, email)
+        task = {'source': name, 'query': query, 'options': options}
+        page_size = {'arxiv': ARXIV_PAGE_SIZE, 'google_scholar': GOOGLE_SCHOLAR_PAGE_SIZE}.get(name)
+        if page_size:
+            return [{**task, 'position': start} for start in range(0, self._max_results(name, options), page_size)]
+        if name == 'openalex':
+            return [{**task, 'position': '*', 'fetched': 0}]
+        return [{**task, 'position': None}]
+
+    def submit_tasks(self, tasks, query, sources=None, max_results=None, email=None, run=None):
+        # run : identifiant de la soumission (nouveau par défaut) ; le réutiliser rend la soumission idempotente
+        run = run or new_run_id()
+        planned = []
+        for name in self._check_sources(sources):
             try:
-                title = item.find('h2').text.strip()
-                if is_duplicate(title):
-                    continue
+                planned.extend({**task, 'run': run} for task in self.plan_tasks(name, query, max_results, email))
+            except ValueError as e:
+                logging.error(f"{name} skipped: {str(e)}")
+        added = tasks.enqueue(planned)
+        logging.info(f"Queued {added} new tasks for '{query}' in run {run} ({len(planned) - added} already known)")
+        return added
 
-                publication = {
-                    'title': title,
-                    'authors': [author.text.strip() for author in item.find_all('span', class_='author')] if item.find_all('span', class_='author') else [],
-                    'year': item.find('span', class_='year').text.strip() if item.find('span', class_='year') else '',
-                    'journal': item.find('span', class_='journal').text.strip() if item.find('span', class_='journal') else '',
-                    'link': item.find('a')['href'] if item.find('a') else '',
-                    'source': 'ResearchGate'
-                }
-                results.append(publication)
-            except Exception as e:
-                logging.error(f"ResearchGate processing error: {str(e)}")
+    def run_task(self, task):
+        # Une requête HTTP par tâche, enregistrée par _save_results ; renvoie (nombre, tâches suivantes)
+        name, query = task['source'], task['query']
+        options = dict(task.get('options') or {})
+        follow_ups = []
+        if name in ('pubmed', 'medline'):
+            if task.get('ids') is None:
+                # Recherche (position None) : une tâche de liste par tranche de NCBI_ID_BATCH_SIZE IDs ;
+                # liste (position {'list': début de tranche}) : un lot d'IDs par tâche suivante. Chaque
+                # tâche relance la recherche, un WebEnv expirant pendant l'attente dans la file
+                history = self._ncbi_search(name, query)
+                if history is None:
+                    raise RuntimeError(f"{name} search failed")
+                total = min(history[2], self._max_results(name, options))
+                if task.get('position') is None:
+                    return 0, [{**task, 'position': {'list': start}} for start in range(0, total, NCBI_ID_BATCH_SIZE)]
+                start = task['position']['list']
+                ids = self._ncbi_history_ids(name, history, start, min(start + NCBI_ID_BATCH_SIZE, total))
+                if ids is None:
+                    raise RuntimeError(f"{name} ID listing failed")
+                return 0, [
+                    {**task, 'position': start + offset, 'ids': ids[offset:offset + self.ncbi_batch_size]}
+                    for offset in range(0, len(ids), self.ncbi_batch_size)
+                ]
+            response = self._ncbi_efetch(name, task['ids'])
+            page = response.content if response else None
+        else:
+            state = CrawlState(source=name, query=query)
+            state.position = task.get('position')
+            if name == 'openalex':
+                # Une seule page, sans préchargement de la suivante, bornée au reste à récupérer
+                options['max_results'] = self._max_results(name, options) - task.get('fetched', 0)
+                options['prefetch'] = False
+            pages = getattr(self, f'_fetch_{name}')(query, state=state, **options)
+            try:
+                page = next(pages, None)
+            finally:
+                pages.close()
+            if name == 'openalex' and page:
+                fetched = task.get('fetched', 0) + len(page)
+                if state.next_position and fetched < self._max_results(name, task.get('options') or {}):
+                    follow_ups.append({**task, 'position': state.next_position, 'fetched': fetched})
+        if page is None:
+            raise RuntimeError(f"{name}: no response")
+        records = self._parse_page(name, page)
+        self._extract_entities(records, name)
+        if not self._save_results(records):
+            raise RuntimeError(f"{name}: publications not saved")  # tâche reprise (voir TaskQueue.fail)
+        return len(records), follow_ups
 
-        self._save_results(results)
-        return results
+    def run_worker(self, tasks, max_tasks=None, drain=False, **worker_options):
+        return CrawlWorker(self, tasks, **worker_options).run(max_tasks, drain)
 
-        def citeseerx_scraper(self, query, max_results=500):
-            results = []
-            url = "http://citeseerx.ist.psu.edu/search"
-            params = {
-                'q': query,
-                'start': 0,
-                'rows': max_results
-            }
+    def _check_sources(self, sources):
+        sources = list(sources or SOURCES)
+        unknown = [name for name in sources if name not in SOURCES]
+        if unknown:
+            raise ValueError(f"Unknown sources: {', '.join(unknown)}")
+        return sources
 
-            response = self.safe_request(url, params)
-            if not response:
-                return results
+    def _source_kwargs(self, name, max_results=None, email=None):
+        kwargs = {}
+        if name == 'openalex':
+            if not email:
+                raise ValueError("OpenAlex requires an email for the polite pool")
+            kwargs['email'] = email
+        if isinstance(max_results, dict):
+            max_results = max_results.get(name)
+        if max_results is not None:
+            kwargs['max_results'] = max_results
+        return kwargs
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            for item in soup.find_all('div', class_='result'):
-                try:
-                    title = item.find('h3').text.strip()
-                    if is_duplicate(title):
-                        continue
+    def _run_source(self, name, query, max_results=None, email=None, collect=True):
+        kwargs = self._source_kwargs(name, max_results, email)
 
-                    publication = {
-                        'title': title,
-                        'authors': [author.text.strip() for author in item.find_all('span', class_='author')] if item.find_all('span', class_='author') else [],
-                        'year': item.find('span', class_='year').text.strip() if item.find('span', class_='year') else '',
-                        'journal': item.find('span', class_='journal').text.strip() if item.find('span', class_='journal') else '',
-                        'link': item.find('a')['href'] if item.find('a') else '',
-                        'source': 'CiteSeerx'
-                    }
-                    results.append(publication)
-                except Exception as e:
-                    logging.error(f"CiteSeerx processing error: {str(e)}")
+        # Sans collecte, les enregistrements partent directement vers MongoDB (mémoire bornée)
+        start = time.perf_counter()
+        if collect:
+            results = self.crawl_source(name, query, **kwargs)
+            count = len(results)
+        else:
+            results, count = [], self.crawl_source(name, query, collect=False, **kwargs)
+        duration = time.perf_counter() - start
+        self.metrics.observe('source_seconds', duration, source=name)
+        logging.info(f"{name}: {count} publications in {duration:.1f}s")
+        return results, count, duration
 
-            self._save_results(results)
-            return results
+    def _extract_entities(self, results, name=None):
+        labels = {'source': name} if name else {}
+        with self.metrics.timer('ner_seconds', **labels):
+            annotate_entities(results, self.ner_batch_size, self.ner_processes, self.entity_cache, self.config.ner_model)
+        self.metrics.inc('ner_records_total', len(results), **labels)
+        logging.debug(f"NER cache: {self.entity_cache.stats} (hit ratio {self.entity_cache.hit_ratio():.0%})")
+        return results
 
     def _save_results(self, results):
+        # True si toutes les sorties ont confirmé l'écriture : seulement alors les clés entrent dans
+        # l'index de déduplication et l'appelant peut avancer ses points de reprise
         if not results:
-            return
-        try:
+            return True
+        # Écritures sérialisées : chaque lot voit les documents du précédent (liaison MongoDB)
+        saved = []
+        if not self.uses_mongo:
+            # Sans liaison MongoDB, l'empreinte des fichiers exportés est calculée ici
             for publication in results:
-                collection.update_one(
-                    {'title': publication['title']},
-                    {'$set': publication},
-                    upsert=True
-                )
-            logging.info(f"Inserted {len(results)} publications")
-        except Exception as e:
-            logging.error(f"MongoDB error: {str(e)}")
+                publication.setdefault('fingerprint', content_fingerprint(publication))
+        # Arrêt à la première sortie en échec : le lot sera repris en entier (les fichiers déjà
+        # écrits peuvent alors le recevoir deux fois, jamais MongoDB sans les fichiers)
+        with self._save_lock, self.metrics.timer('save_seconds'):
+            for sink in self.sinks:
+                try:
+                    sink.write(results)
+                    saved.append(sink.name)
+                except Exception as e:
+                    logging.error(f"{sink.name} sink error: {str(e)}")
+                    return False
+        for publication in results:
+            self.dedup_index.add(dedup_key(publication))
+        logging.info(f"Saved {len(results)} publications to {', '.join(saved)}")
+        return True
 
 # ------------------- EXECUTION -------------------
 if __name__ == "__main__":
-    scraper = AcademicScraper()
+    # Example usage : python scraping2.py [fichier de travaux]
+    # Mode distribué : python scraping2.py submit <fichier de travaux> [run], puis python scraping2.py worker
+    # sur chaque machine (même MongoDB : file de tâches et limites de débit communes)
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    config = ScraperConfig()
+    scraper = AcademicScraper(
+        config=config, shared_rate_limits=config.rate_limits_collection() if command == 'worker' else None,
+        # Export Parquet/JSONL en plus de MongoDB (SCRAPER_EXPORT_ONLY=1 : sans MongoDB)
+        sinks=export_sinks(EXPORT_DIR) if EXPORT_DIR else (), mongo=not (EXPORT_DIR and EXPORT_ONLY),
+    )
+    if METRICS_PORT:
+        scraper.metrics.serve(METRICS_PORT)
     
-    # Example usage
     try:
-        results = []
-        results += scraper.arxiv_scraper("Sultan Moulay Slimane University", 1000)
-        results += scraper.openalex_scraper("Sultan Moulay Slimane University", "anas.battas@usms.ac.ma", 50)
-        results += scraper.pubmed_scraper("Sultan Moulay Slimane University", 1000)
-        results += scraper.google_scholar_scraper("Sultan Moulay Slimane University", 1009)
-        results += scraper.springer_scraper("Sultan Moulay Slimane University", 1000)
-        results += scraper.hal_scraper("Sultan Moulay Slimane University", 1000)
-        results += scraper.medline_scraper("Sultan Moulay Slimane University", 1000)
-        results += scraper.researchgate_scraper("Sultan Moulay Slimane University", 1000)
-        results += scraper.citeseerx_scraper("Sultan Moulay Slimane University", 1000)
-        results += scraper.scilit_scraper("Sultan Moulay Slimane University", 1000)
-        
-        logging.info(f"Total publications collected: {len(results)}")
+        if command == 'submit':
+            tasks = TaskQueue(config.tasks_collection())
+            run = sys.argv[3] if len(sys.argv) > 3 else new_run_id()
+            for job in load_jobs(sys.argv[2]):
+                scraper.submit_tasks(tasks, job['query'], job.get('sources'), job.get('max_results'),
+                                     job.get('email') or "anas.battas@usms.ac.ma", run=run)
+            logging.info(f"Task queue: {tasks.counts()}")
+        elif command == 'worker':
+            stats = scraper.run_worker(TaskQueue(config.tasks_collection()))
+            logging.info(f"Total publications collected: {stats['records']}")
+        elif command:
+            summary = scraper.run_jobs(load_jobs(command), email="anas.battas@usms.ac.ma")
+            logging.info(f"Total publications collected: {summary['total']}")
+        else:
+            summary = scraper.run_pipeline(
+                "Sultan Moulay Slimane University",
+                email="anas.battas@usms.ac.ma",
+                max_results={
+                    'arxiv': 1000, 'openalex': 50, 'pubmed': 1000, 'google_scholar': 1009,
+                    'springer': 1000, 'hal': 1000, 'medline': 1000, 'researchgate': 1000,
+                    'citeseerx': 1000, 'scilit': 1000,
+                },
+            )
+            logging.info(f"Total publications collected: {summary['total']}")
     except KeyboardInterrupt:
         logging.warning("Process interrupted by user")
     except Exception as e:
         logging.error(f"Critical error: {str(e)}")
+    finally:
+        scraper.close()
+        scraper.metrics.write_json(METRICS_JSON_PATH)
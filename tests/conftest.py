@@ -0,0 +1,38 @@
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark  # noqa: E402
+import scraping2  # noqa: E402
+
+mongomock = pytest.importorskip('mongomock')
+
+
+@pytest.fixture(scope='session')
+def fixture_server():
+    # Serveur local de benchmark.py : mêmes réponses que les vraies API, sans réseau
+    server = benchmark.start_fixture_server()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def database():
+    return mongomock.MongoClient().db
+
+
+@pytest.fixture
+def make_scraper(fixture_server, database):
+    # make_scraper(taille, **options) : scraper branché sur le serveur local, `taille` résultats par source
+    def make(size, collection=None, **options):
+        options.setdefault('rate_limits', dict.fromkeys(benchmark.FIXTURE_HOSTS, benchmark.UNLIMITED_RATE))
+        return benchmark.BenchmarkScraper(
+            f"{fixture_server}/{size}", mongo_collection=database.publications if collection is None else collection,
+            checkpoints=False, entity_cache=scraping2.EntityCache(None), response_cache=False,
+            config=scraping2.ScraperConfig(log_file=None, log_level=logging.WARNING), **options,
+        )
+    return make
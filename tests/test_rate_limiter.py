@@ -0,0 +1,66 @@
+import threading
+import time
+
+import benchmark
+from scraping2 import HostRateLimiter, TokenBucket
+
+ARXIV = "http://export.arxiv.org/api/query"
+HAL = "https://hal.archives-ouvertes.fr/search/index/"
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def test_bucket_allows_a_burst_then_spaces_requests():
+    bucket = TokenBucket(10, 1)
+    assert timed(lambda: [bucket.acquire() for _ in range(10)]) < 0.05
+    # 10 jetons de plus à 10/s : environ une seconde
+    assert 0.9 <= timed(lambda: [bucket.acquire() for _ in range(10)]) < 1.5
+
+
+def test_pause_holds_the_next_token_for_retry_after():
+    bucket = TokenBucket(10, 1)
+    bucket.pause(0.3)
+    assert 0.28 <= timed(bucket.acquire) < 0.45
+
+
+def test_limits_are_per_host_and_overridable():
+    limiter = HostRateLimiter({'export.arxiv.org': (5, 1)}, ncbi_api_key='key')
+    assert limiter.bucket(ARXIV).rate == 5
+    assert limiter.bucket("https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi").rate == 10
+    assert limiter.bucket(ARXIV) is limiter.bucket(ARXIV + "?start=10")
+    assert limiter.bucket(HAL) is not limiter.bucket(ARXIV)
+
+
+def test_requests_wait_only_for_their_own_host(make_scraper):
+    # arXiv limité à 5 requêtes/s, les autres hôtes du serveur local sans limite
+    limits = dict.fromkeys(benchmark.FIXTURE_HOSTS, benchmark.UNLIMITED_RATE)
+    limits['export.arxiv.org'] = (5, 1)
+    scraper = make_scraper(100, rate_limits=limits)
+    elapsed, responses = {}, []
+
+    def crawl(name, url, params):
+        def run():
+            for i in range(10):
+                responses.append(scraper.safe_request(url, {**params, 'start': i}))
+        elapsed[name] = timed(run)
+
+    threads = [
+        threading.Thread(target=crawl, args=('arxiv', ARXIV, {'search_query': 'all:q'})),
+        threading.Thread(target=crawl, args=('hal', HAL, {'q': 'q'})),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(responses) == 20 and all(response is not None and response.ok for response in responses)
+    # 5 requêtes en rafale puis une toutes les 0,2 s ; HAL n'attend pas le seau d'arXiv
+    assert 0.9 <= elapsed['arxiv'] < 2.0
+    assert elapsed['hal'] < 0.5
+    stats = scraper.request_stats()
+    assert stats['export.arxiv.org']['requests'] == 10
+    assert stats['hal.archives-ouvertes.fr']['requests'] == 10
@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+import scraping2
+from scraping2 import TaskQueue
+
+
+def task(position, run='r1', source='hal', query='q'):
+    return {'run': run, 'source': source, 'query': query, 'position': position, 'options': {}}
+
+
+@pytest.fixture
+def tasks(database):
+    return TaskQueue(database.tasks)
+
+
+def drain(scraper, tasks):
+    return scraper.run_worker(tasks, drain=True, poll_interval=0.01, worker_id='w1')
+
+
+def test_enqueue_is_idempotent_within_a_run(tasks):
+    assert tasks.enqueue([task(0), task(10)]) == 2
+    assert tasks.enqueue([task(0), task(10)]) == 0
+    assert tasks.enqueue([task(0, run='r2')]) == 1
+    assert tasks.counts() == {'pending': 3, 'leased': 0, 'done': 0, 'failed': 0}
+
+
+def test_claim_takes_the_oldest_task_and_complete_queues_follow_ups(tasks):
+    tasks.enqueue([task(0)])
+    tasks.enqueue([task(10)])
+    claimed = tasks.claim('w1')
+    assert claimed['position'] == 0 and claimed['attempts'] == 1 and claimed['worker'] == 'w1'
+    assert tasks.complete(claimed, 'w1', records=5, follow_ups=[task(20)])
+    assert tasks.counts() == {'pending': 2, 'leased': 0, 'done': 1, 'failed': 0}
+    # Rejouer la confirmation (worker relancé) ne duplique pas les tâches suivantes
+    assert not tasks.complete(claimed, 'w1', follow_ups=[task(20)])
+    assert tasks.counts()['pending'] == 2
+
+
+def test_failed_task_is_retried_until_max_attempts(database):
+    tasks = TaskQueue(database.tasks, max_attempts=2)
+    tasks.enqueue([task(0)])
+    assert tasks.fail(tasks.claim('w1'), 'w1', 'boom') == 'pending'
+    assert tasks.fail(tasks.claim('w1'), 'w1', 'boom') == 'failed'
+    assert tasks.claim('w1') is None
+    assert database.tasks.find_one()['error'] == 'boom'
+
+
+def test_expired_lease_is_requeued_and_the_old_worker_loses_it(database):
+    tasks = TaskQueue(database.tasks, lease=0.05, max_attempts=2)
+    tasks.enqueue([task(0)])
+    claimed = tasks.claim('dead')
+    assert tasks.heartbeat(claimed, 'dead')
+    time.sleep(0.1)
+    assert tasks.requeue_expired() == 1
+    assert not tasks.heartbeat(claimed, 'dead')
+    assert not tasks.complete(claimed, 'dead')
+    tasks.claim('dead')
+    time.sleep(0.1)
+    tasks.requeue_expired()
+    assert tasks.counts()['failed'] == 1
+
+
+def test_plan_offset_and_cursor_sources(make_scraper):
+    scraper = make_scraper(100)
+    arxiv = scraper.plan_tasks('arxiv', 'q', {'arxiv': 250})
+    assert [t['position'] for t in arxiv] == list(range(0, 250, scraping2.ARXIV_PAGE_SIZE))
+    assert scraper.plan_tasks('openalex', 'q', email='a@b.c')[0]['position'] == '*'
+    assert scraper.plan_tasks('pubmed', 'q')[0]['position'] is None
+
+
+def test_ncbi_slices_and_batches_fetch_every_record(make_scraper, tasks, database, monkeypatch):
+    # Une recherche de 250 résultats : 3 tranches de listage, puis 25 lots efetch. Le premier lot
+    # d'une tranche commence au même index qu'elle et doit rester une tâche distincte.
+    monkeypatch.setattr(scraping2, 'NCBI_ID_BATCH_SIZE', 100)
+    scraper = make_scraper(250, ncbi_batch_size=10)
+    assert scraper.submit_tasks(tasks, 'q', ['pubmed'], {'pubmed': 250}) == 1
+    stats = drain(scraper, tasks)
+    assert stats['failed'] == 0 and stats['records'] == 250
+    assert tasks.counts() == {'pending': 0, 'leased': 0, 'done': 1 + 3 + 25, 'failed': 0}
+    listings = database.tasks.find({'position.list': {'$exists': True}})
+    assert sorted(t['position']['list'] for t in listings) == [0, 100, 200]
+    assert database.publications.count_documents({}) == 250
+
+
+def test_resubmission_starts_a_new_run(make_scraper, tasks, database):
+    scraper = make_scraper(30)
+    assert scraper.submit_tasks(tasks, 'q', ['hal', 'arxiv'], {'arxiv': 30}, run='night-1') == 2
+    assert scraper.submit_tasks(tasks, 'q', ['hal', 'arxiv'], {'arxiv': 30}, run='night-1') == 0
+    drain(scraper, tasks)
+    # La nuit suivante : de nouvelles tâches, exécutées malgré celles déjà terminées
+    assert scraper.submit_tasks(tasks, 'q', ['hal', 'arxiv'], {'arxiv': 30}) == 2
+    assert drain(scraper, tasks)['tasks'] == 2
+    assert tasks.counts() == {'pending': 0, 'leased': 0, 'done': 4, 'failed': 0}